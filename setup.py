@@ -9,7 +9,7 @@ setup(
     install_requires=[
         "numpy>=1.26.0",
         "pandas>=2.2.0",
-        "streamlit>=1.29.0",
+        "streamlit>=1.37.0",  # st.fragment
         "matplotlib>=3.8.0",
         "scipy>=1.13.0",
         "plotly>=5.18.0",
@@ -1,12 +1,18 @@
 """
 Agente Empresas: Sector productivo (hidrocarburos y minerales)
+
+Las ecuaciones aceptan escalares o arreglos NumPy de forma (n_escenarios,),
+de modo que un periodo de todos los escenarios se resuelve con unas pocas
+ufuncs y el llamador sólo itera sobre el tiempo.
 """
 import numpy as np
-from typing import Dict
+from typing import ClassVar, Dict, NamedTuple
 from dataclasses import dataclass
 
+from .historial import Historial
+
 
-@dataclass
+@dataclass(slots=True)
 class EstadoEmpresas:
     """Estado del sector empresarial"""
     # Producción
@@ -32,6 +38,156 @@ class EstadoEmpresas:
     utilizacion_capacidad_minerales: float = 0.0
 
 
+class PasoEmpresas(NamedTuple):
+    """Resultado de un periodo del sector empresarial (un arreglo por campo)"""
+    produccion_gas: np.ndarray
+    produccion_minerales: np.ndarray
+    ingresos_gas: np.ndarray
+    ingresos_minerales: np.ndarray
+    ingresos_totales: np.ndarray
+    costos_produccion: np.ndarray
+    utilidades: np.ndarray
+    inversion: np.ndarray
+    utilizacion_capacidad_gas: np.ndarray
+    utilizacion_capacidad_minerales: np.ndarray
+
+
+# Oferta elástica al precio: recíproco del precio de referencia y elasticidad
+_INV_PRECIO_BASE_GAS = 1.0 / 50.0  # USD referencia
+_INV_PRECIO_BASE_MINERALES = 1.0 / 2500.0  # USD/ton referencia
+_ELASTICIDAD_MINERALES = 0.4
+
+# Ajuste de escala de los minerales en ingresos y costos
+_ESCALA_MINERALES = 0.001
+
+
+def _factor_precio_gas(precio):
+    """(P/P_base)^0.5 como raíz cuadrada, más barata que una potencia general"""
+    return np.sqrt(precio * _INV_PRECIO_BASE_GAS)
+
+
+def _factor_precio_minerales(precio):
+    """
+    (P/P_base)^0.4 como exp(0.4·log(x))
+    
+    En arreglos, log y exp tienen bucles SIMD en NumPy mientras que una
+    potencia no entera recurre a pow elemento a elemento.
+    """
+    return np.exp(_ELASTICIDAD_MINERALES * np.log(precio * _INV_PRECIO_BASE_MINERALES))
+
+
+def _acotar(produccion, capacidad):
+    """
+    Acota la producción a [0, capacidad] en una sola pasada
+    
+    `produccion` debe ser un temporal: si es un arreglo se recorta en el lugar.
+    """
+    if isinstance(produccion, np.ndarray) and produccion.ndim:
+        return np.clip(produccion, 0.0, capacidad, out=produccion)
+    return np.clip(produccion, 0.0, capacidad)
+
+
+def _produccion(factor_precio, produccion_base, capacidad, ajuste_demanda):
+    """
+    Q = Q_base * (P/P_base)^elasticidad * demanda * (1 + shock), acotada a [0, capacidad]
+    
+    Núcleo numérico sin objetos: sólo recibe escalares o arreglos.
+    `ajuste_demanda` es demanda * (1 + shock), común a gas y minerales.
+    """
+    produccion = produccion_base * factor_precio * ajuste_demanda
+    return _acotar(produccion, capacidad)
+
+
+def _ingresos(produccion_gas, produccion_minerales, precio_gas, precio_minerales):
+    """Ingresos por ventas: (gas, minerales, totales)"""
+    ingresos_gas = produccion_gas * precio_gas
+    ingresos_minerales = produccion_minerales * precio_minerales * _ESCALA_MINERALES
+    return ingresos_gas, ingresos_minerales, ingresos_gas + ingresos_minerales
+
+
+def _costos(costo_unitario_gas, costo_unitario_minerales,
+           produccion_gas, produccion_minerales, ajuste_costos):
+    """
+    C = (c_gas * Q_gas + c_minerales * Q_minerales) * (1 + shock_costos)
+    
+    `costo_unitario_minerales` ya incluye el ajuste de escala (ver
+    `constantes_empresas`) y `ajuste_costos` es 1 + shock_costos.
+    """
+    return (costo_unitario_gas * produccion_gas +
+            costo_unitario_minerales * produccion_minerales) * ajuste_costos
+
+
+class ConstantesEmpresas(NamedTuple):
+    """Parámetros del paso empresarial, con recíprocos y escalas ya aplicados"""
+    produccion_gas_base: float
+    capacidad_maxima_gas: float
+    inv_capacidad_gas: float
+    costo_gas: float
+    produccion_minerales_base: float
+    capacidad_maxima_minerales: float
+    inv_capacidad_minerales: float
+    costo_minerales: float  # por unidad, con el ajuste de escala
+    tasa_inversion: float
+
+
+def constantes_empresas(params) -> ConstantesEmpresas:
+    """Empaqueta ParametrosEmpresas en la tupla plana que consume `paso_empresas`"""
+    return ConstantesEmpresas(
+        produccion_gas_base=params.produccion_gas_base,
+        capacidad_maxima_gas=params.capacidad_maxima_gas,
+        inv_capacidad_gas=1.0 / params.capacidad_maxima_gas,
+        costo_gas=params.costo_produccion_gas,
+        produccion_minerales_base=params.produccion_minerales_base,
+        capacidad_maxima_minerales=params.capacidad_maxima_minerales,
+        inv_capacidad_minerales=1.0 / params.capacidad_maxima_minerales,
+        costo_minerales=params.costo_produccion_minerales * _ESCALA_MINERALES,
+        tasa_inversion=params.tasa_inversion
+    )
+
+
+def paso_empresas(constantes: ConstantesEmpresas,
+                  precio_gas,
+                  precio_minerales,
+                  demanda_global=1.0,
+                  shock_productividad=0.0,
+                  shock_costos=0.0) -> PasoEmpresas:
+    """
+    Calcula un periodo completo del sector empresarial como función pura
+    
+    Precios y shocks pueden ser arreglos de forma (n_escenarios,); el
+    resultado contiene un arreglo por campo con la misma forma.
+    
+    Usa los mismos núcleos que los métodos `calcular_*` del agente; el
+    ajuste por demanda y shock se calcula una vez para ambos productos.
+    """
+    c = constantes
+    ajuste_demanda = demanda_global * (1 + shock_productividad)
+    
+    q_gas = _produccion(_factor_precio_gas(precio_gas), c.produccion_gas_base,
+                        c.capacidad_maxima_gas, ajuste_demanda)
+    q_min = _produccion(_factor_precio_minerales(precio_minerales),
+                        c.produccion_minerales_base,
+                        c.capacidad_maxima_minerales, ajuste_demanda)
+    
+    ing_gas, ing_min, ing_total = _ingresos(q_gas, q_min, precio_gas, precio_minerales)
+    costo = _costos(c.costo_gas, c.costo_minerales, q_gas, q_min, 1 + shock_costos)
+    util = ing_total - costo
+    
+    return PasoEmpresas(
+        produccion_gas=q_gas,
+        produccion_minerales=q_min,
+        ingresos_gas=ing_gas,
+        ingresos_minerales=ing_min,
+        ingresos_totales=ing_total,
+        costos_produccion=costo,
+        utilidades=util,
+        # I = tasa_inversion * max(utilidades, 0)
+        inversion=c.tasa_inversion * np.maximum(util, 0.0),
+        utilizacion_capacidad_gas=q_gas * c.inv_capacidad_gas,
+        utilizacion_capacidad_minerales=q_min * c.inv_capacidad_minerales
+    )
+
+
 class AgenteEmpresas:
     """
     Agente que representa al sector empresarial productivo
@@ -43,10 +199,15 @@ class AgenteEmpresas:
     4. Responde a shocks de productividad
     """
     
+    # Fracción de los ingresos por ventas que se exporta
+    FRACCION_EXPORTADA: ClassVar[float] = 0.8
+    
     def __init__(self, parametros):
         self.params = parametros
+        # Constantes del paso; ajustar_capacidad las recalcula
+        self._constantes = constantes_empresas(parametros)
         self.estado = EstadoEmpresas()
-        self.historia = []
+        self.historia = Historial(PasoEmpresas._fields)
         
         # Inicializar producción base
         self.estado.produccion_gas = parametros.produccion_gas_base
@@ -62,29 +223,10 @@ class AgenteEmpresas:
         Función de oferta elástica al precio:
         Q = Q_base * (P/P_base)^elasticidad * demanda * (1 + shock)
         """
-        precio_base = 50.0  # USD referencia
-        elasticidad_oferta = 0.5  # Elasticidad precio de oferta
-        
-        # Efecto precio
-        factor_precio = (precio / precio_base) ** elasticidad_oferta
-        
-        # Efecto demanda
-        factor_demanda = demanda_global
-        
-        # Shock de productividad
-        factor_shock = 1 + shock
-        
-        # Producción deseada
-        produccion = (self.params.produccion_gas_base * 
-                     factor_precio * 
-                     factor_demanda * 
-                     factor_shock)
-        
-        # Límite de capacidad
-        produccion = min(produccion, self.params.capacidad_maxima_gas)
-        produccion = max(produccion, 0)
-        
-        return produccion
+        return _produccion(_factor_precio_gas(precio),
+                           self.params.produccion_gas_base,
+                           self.params.capacidad_maxima_gas,
+                           demanda_global * (1 + shock))
     
     def calcular_produccion_minerales(self,
                                      precio: float,
@@ -93,34 +235,24 @@ class AgenteEmpresas:
         """
         Calcula producción de minerales (zinc, plata, etc.)
         """
-        precio_base = 2500.0  # USD/ton referencia
-        elasticidad_oferta = 0.4
-        
-        factor_precio = (precio / precio_base) ** elasticidad_oferta
-        factor_demanda = demanda_global
-        factor_shock = 1 + shock
-        
-        produccion = (self.params.produccion_minerales_base * 
-                     factor_precio * 
-                     factor_demanda * 
-                     factor_shock)
-        
-        produccion = min(produccion, self.params.capacidad_maxima_minerales)
-        produccion = max(produccion, 0)
-        
-        return produccion
+        return _produccion(_factor_precio_minerales(precio),
+                           self.params.produccion_minerales_base,
+                           self.params.capacidad_maxima_minerales,
+                           demanda_global * (1 + shock))
     
     def calcular_ingresos(self,
                          precio_gas: float,
                          precio_minerales: float) -> Dict[str, float]:
         """Calcula ingresos por ventas"""
-        ingresos_gas = self.estado.produccion_gas * precio_gas
-        ingresos_minerales = self.estado.produccion_minerales * precio_minerales * 0.001  # Ajuste de escala
+        ingresos_gas, ingresos_minerales, ingresos_totales = _ingresos(
+            self.estado.produccion_gas, self.estado.produccion_minerales,
+            precio_gas, precio_minerales
+        )
         
         return {
             'gas': ingresos_gas,
             'minerales': ingresos_minerales,
-            'totales': ingresos_gas + ingresos_minerales
+            'totales': ingresos_totales
         }
     
     def calcular_costos(self, shock_costos: float = 0.0) -> float:
@@ -129,16 +261,10 @@ class AgenteEmpresas:
         
         C = c_gas * Q_gas + c_minerales * Q_minerales
         """
-        costo_gas = (self.params.costo_produccion_gas * 
-                    self.estado.produccion_gas * 
-                    (1 + shock_costos))
-        
-        costo_minerales = (self.params.costo_produccion_minerales * 
-                          self.estado.produccion_minerales * 
-                          0.001 *  # Ajuste de escala
-                          (1 + shock_costos))
-        
-        return costo_gas + costo_minerales
+        return _costos(self.params.costo_produccion_gas,
+                       self.params.costo_produccion_minerales * _ESCALA_MINERALES,
+                       self.estado.produccion_gas,
+                       self.estado.produccion_minerales, 1 + shock_costos)
     
     def calcular_inversion(self, utilidades: float) -> float:
         """
@@ -146,53 +272,29 @@ class AgenteEmpresas:
         
         I = tasa_inversion * max(utilidades, 0)
         """
-        if utilidades > 0:
-            return self.params.tasa_inversion * utilidades
-        return 0.0
+        return self.params.tasa_inversion * np.maximum(utilidades, 0.0)
     
     def actualizar_estado(self,
                          precio_gas: float,
                          precio_minerales: float,
                          demanda_global: float = 1.0,
                          shock_productividad: float = 0.0,
-                         shock_costos: float = 0.0) -> EstadoEmpresas:
+                         shock_costos: float = 0.0,
+                         t: int = None) -> EstadoEmpresas:
         """
         Actualiza el estado completo del sector empresarial
-        """
-        # 1. Calcular producción
-        self.estado.produccion_gas = self.calcular_produccion_gas(
-            precio_gas, demanda_global, shock_productividad
-        )
-        
-        self.estado.produccion_minerales = self.calcular_produccion_minerales(
-            precio_minerales, demanda_global, shock_productividad
-        )
-        
-        # 2. Calcular ingresos
-        ingresos = self.calcular_ingresos(precio_gas, precio_minerales)
-        self.estado.ingresos_gas = ingresos['gas']
-        self.estado.ingresos_minerales = ingresos['minerales']
-        self.estado.ingresos_totales = ingresos['totales']
         
-        # 3. Calcular costos
-        self.estado.costos_produccion = self.calcular_costos(shock_costos)
-        
-        # 4. Calcular utilidades
-        self.estado.utilidades = self.estado.ingresos_totales - self.estado.costos_produccion
-        
-        # 5. Determinar inversión
-        self.estado.inversion = self.calcular_inversion(self.estado.utilidades)
-        
-        # 6. Calcular utilización de capacidad
-        self.estado.utilizacion_capacidad_gas = (
-            self.estado.produccion_gas / self.params.capacidad_maxima_gas
-        )
-        self.estado.utilizacion_capacidad_minerales = (
-            self.estado.produccion_minerales / self.params.capacidad_maxima_minerales
+        Acepta escalares o arreglos de forma (n_escenarios,). `t` es la fila
+        de la historia a escribir (por defecto, el siguiente periodo).
+        """
+        paso = paso_empresas(
+            self._constantes, precio_gas, precio_minerales,
+            demanda_global, shock_productividad, shock_costos
         )
+        self.estado = EstadoEmpresas(*paso)
         
         # Guardar historia
-        self.historia.append(self.estado.__dict__.copy())
+        self.historia.registrar(paso, t)
         
         return self.estado
     
@@ -207,14 +309,24 @@ class AgenteEmpresas:
         if inversion_acumulada > 0:
             self.params.capacidad_maxima_gas *= (1 + factor_expansion * inversion_acumulada)
             self.params.capacidad_maxima_minerales *= (1 + factor_expansion * inversion_acumulada)
+            self._constantes = constantes_empresas(self.params)
     
     def get_exportaciones(self) -> float:
         """Retorna valor de exportaciones totales"""
-        return self.estado.ingresos_totales * 0.8  # 80% se exporta
+        return self.estado.ingresos_totales * self.FRACCION_EXPORTADA
+    
+    def reservar_historia(self, num_periodos: int, ruta_memmap=None, tipo=None):
+        """
+        Preasigna la historia para un horizonte de `num_periodos`
+        
+        Con `ruta_memmap` la historia se respalda en ese archivo (np.memmap);
+        `tipo` fija su precisión (ver `Historial`).
+        """
+        self.historia.reservar(num_periodos, ruta_memmap, tipo)
     
     def reset(self):
         """Reinicia el estado del agente"""
         self.estado = EstadoEmpresas()
         self.estado.produccion_gas = self.params.produccion_gas_base
         self.estado.produccion_minerales = self.params.produccion_minerales_base
-        self.historia = []
\ No newline at end of file
+        self.historia.vaciar()
\ No newline at end of file
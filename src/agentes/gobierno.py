@@ -1,12 +1,18 @@
 """
 Agente Gobierno: Gestiona ingresos, gastos, déficit y deuda
+
+Las ecuaciones aceptan escalares o arreglos NumPy de forma (n_escenarios,);
+las decisiones condicionales se expresan con ufuncs para que un mismo paso
+resuelva todos los escenarios a la vez.
 """
 import numpy as np
-from typing import Dict, Tuple
+from typing import NamedTuple, Tuple
 from dataclasses import dataclass
 
+from .historial import Historial
+
 
-@dataclass
+@dataclass(slots=True)
 class EstadoGobierno:
     """Estado del gobierno en un periodo t"""
     ingresos_totales: float = 0.0
@@ -33,6 +39,280 @@ class EstadoGobierno:
     ratio_deficit_pib: float = 0.0
 
 
+class PasoGobierno(NamedTuple):
+    """Resultado de un periodo del gobierno (un arreglo por campo)"""
+    ingresos_totales: np.ndarray
+    ingresos_tributarios: np.ndarray
+    ingresos_hidrocarburos: np.ndarray
+    ingresos_minerales: np.ndarray
+    otros_ingresos: np.ndarray
+    
+    gastos_totales: np.ndarray
+    gasto_corriente: np.ndarray
+    gasto_capital: np.ndarray
+    subsidios: np.ndarray
+    servicio_deuda: np.ndarray
+    
+    deficit: np.ndarray
+    deficit_primario: np.ndarray
+    superavit_primario: np.ndarray
+    
+    deuda_interna: np.ndarray
+    deuda_externa: np.ndarray
+    deuda_total: np.ndarray
+    
+    ratio_deuda_pib: np.ndarray
+    ratio_deficit_pib: np.ndarray
+
+
+class IngresosGobierno(NamedTuple):
+    """Componentes de los ingresos de un periodo"""
+    tributarios: np.ndarray
+    hidrocarburos: np.ndarray
+    minerales: np.ndarray
+    otros: np.ndarray
+    totales: np.ndarray
+
+
+class GastosGobierno(NamedTuple):
+    """Componentes del gasto de un periodo (sin servicio de deuda)"""
+    corriente: np.ndarray
+    capital: np.ndarray
+    subsidios: np.ndarray
+    totales_sin_deuda: np.ndarray
+
+
+class SostenibilidadFiscal(NamedTuple):
+    """Indicadores de `AgenteGobierno.evaluar_sostenibilidad`"""
+    ratio_deuda_pib: np.ndarray
+    carga_intereses: np.ndarray
+    balance_primario_requerido: np.ndarray
+    balance_primario_actual: np.ndarray
+    margen_fiscal: np.ndarray
+    sostenible: np.ndarray
+
+
+class ConstantesGobierno(NamedTuple):
+    """Combinaciones de parámetros que no cambian entre periodos"""
+    tasa_tributaria_efectiva: float
+    regalias_gas: float
+    regalias_minerales: float
+    gasto_corriente_base: float
+    gasto_capital_base: float
+    subsidios_base: float
+    inercia: float
+    complemento_inercia: float
+    limite_deficit_pib: float
+    preferencia_interna: float
+    preferencia_externa: float
+
+
+def constantes_gobierno(params) -> ConstantesGobierno:
+    """Evalúa una sola vez las constantes del paso a partir de ParametrosGobierno"""
+    return ConstantesGobierno(
+        tasa_tributaria_efectiva=params.tasa_impositiva_base *
+            (1 + params.elasticidad_recaudacion_pib * 0.01),
+        regalias_gas=params.participacion_regalias_gas,
+        regalias_minerales=params.participacion_regalias_minerales,
+        gasto_corriente_base=params.gasto_corriente_base,
+        gasto_capital_base=params.gasto_capital_base,
+        subsidios_base=params.subsidios_base,
+        inercia=params.inercia_gasto,
+        complemento_inercia=1.0 - params.inercia_gasto,
+        limite_deficit_pib=params.limite_deficit_pib,
+        preferencia_interna=params.preferencia_deuda_interna,
+        preferencia_externa=1.0 - params.preferencia_deuda_interna
+    )
+
+
+def _ingresos(pib, precio_gas, precio_minerales,
+              produccion_gas, produccion_minerales, shock,
+              tasa_tributaria_efectiva, regalias_gas, regalias_minerales):
+    """(tributarios, hidrocarburos, minerales, otros, totales)"""
+    # Ingresos tributarios (función del PIB con elasticidad ya incorporada)
+    ingresos_trib = pib * tasa_tributaria_efectiva
+    
+    # Shock estocástico en recaudación
+    ingresos_trib = ingresos_trib * (1 + shock)
+    
+    # Ingresos de hidrocarburos (regalías del gas)
+    ingresos_gas = precio_gas * produccion_gas * regalias_gas
+    
+    # Ingresos de minerales
+    ingresos_minerales = precio_minerales * produccion_minerales * regalias_minerales
+    
+    # Otros ingresos (tasas, multas, etc.) - simplificado
+    otros_ingresos = pib * 0.02
+    
+    ingresos_totales = (ingresos_trib + ingresos_gas +
+                        ingresos_minerales + otros_ingresos)
+    
+    return ingresos_trib, ingresos_gas, ingresos_minerales, otros_ingresos, ingresos_totales
+
+
+def _gastos(pib, gasto_anterior, demanda_social, shock,
+            gasto_corriente_base, gasto_capital_base, subsidios_base,
+            inercia, complemento_inercia):
+    """(corriente, capital, subsidios, totales_sin_deuda)"""
+    # Gasto corriente (salarios, operación)
+    gasto_base_corriente = pib * gasto_corriente_base
+    
+    # Inercia del gasto sólo si existe un gasto previo
+    gasto_corriente = np.where(
+        gasto_anterior > 0,
+        inercia * gasto_anterior * 0.8 + complemento_inercia * gasto_base_corriente,
+        gasto_base_corriente
+    )
+    
+    # Shock estocástico
+    gasto_corriente = gasto_corriente * (1 + shock)
+    
+    # Gasto de capital (inversión pública)
+    gasto_capital = pib * gasto_capital_base
+    
+    # Subsidios (combustibles, alimentos)
+    subsidios = pib * subsidios_base * demanda_social
+    
+    gastos_totales = gasto_corriente + gasto_capital + subsidios
+    
+    return gasto_corriente, gasto_capital, subsidios, gastos_totales
+
+
+def _deficit(ingresos, gastos, servicio_deuda):
+    """(deficit_total, deficit_primario)"""
+    return ingresos - (gastos + servicio_deuda), ingresos - gastos
+
+
+def _financiamiento(deficit, pib, limite_deficit_pib,
+                    preferencia_interna, preferencia_externa):
+    """(nueva_deuda_interna, nueva_deuda_externa); cero si hay superávit"""
+    # Monto a financiar acotado por el límite de déficit
+    monto_a_financiar = np.minimum(np.maximum(-deficit, 0.0), pib * limite_deficit_pib)
+    
+    # Distribución entre deuda interna y externa
+    nueva_deuda_interna = monto_a_financiar * preferencia_interna
+    nueva_deuda_externa = monto_a_financiar * preferencia_externa
+    
+    return nueva_deuda_interna, nueva_deuda_externa
+
+
+def paso_gobierno(constantes: ConstantesGobierno,
+                  deuda_interna,
+                  deuda_externa,
+                  gasto_anterior,
+                  pib,
+                  precio_gas,
+                  precio_minerales,
+                  produccion_gas,
+                  produccion_minerales,
+                  tasa_interes_interna,
+                  tasa_interes_externa,
+                  shock_ingresos=0.0,
+                  shock_gastos=0.0) -> PasoGobierno:
+    """
+    Calcula un periodo completo del gobierno como función pura
+    
+    Recibe las constantes de `constantes_gobierno`, el estado previo (deudas
+    y gasto total) y las variables del periodo; estos últimos pueden ser
+    arreglos de forma (n_escenarios,).
+    """
+    c = constantes
+    
+    # 1. Ingresos
+    trib, hidrocarburos, minerales, otros, ingresos_totales = _ingresos(
+        pib, precio_gas, precio_minerales,
+        produccion_gas, produccion_minerales, shock_ingresos,
+        c.tasa_tributaria_efectiva, c.regalias_gas, c.regalias_minerales
+    )
+    
+    # 2. Gastos
+    corriente, capital, subsidios, gastos_sin_deuda = _gastos(
+        pib, gasto_anterior, 1.0, shock_gastos,
+        c.gasto_corriente_base, c.gasto_capital_base, c.subsidios_base,
+        c.inercia, c.complemento_inercia
+    )
+    
+    # 3. Servicio de deuda
+    servicio = deuda_interna * tasa_interes_interna + deuda_externa * tasa_interes_externa
+    
+    # 4. Déficit
+    deficit_total, deficit_primario = _deficit(ingresos_totales, gastos_sin_deuda, servicio)
+    
+    # 5. Financiamiento y 6. deudas
+    nueva_deuda_int, nueva_deuda_ext = _financiamiento(
+        deficit_total, pib, c.limite_deficit_pib,
+        c.preferencia_interna, c.preferencia_externa
+    )
+    deuda_interna = deuda_interna + nueva_deuda_int
+    deuda_externa = deuda_externa + nueva_deuda_ext
+    deuda_total = deuda_interna + deuda_externa
+    
+    # Ratios con un solo recíproco del PIB (0 si el PIB no es positivo)
+    inv_pib = 1.0 / np.where(pib > 0, pib, np.inf)
+    
+    return PasoGobierno(
+        ingresos_totales=ingresos_totales,
+        ingresos_tributarios=trib,
+        ingresos_hidrocarburos=hidrocarburos,
+        ingresos_minerales=minerales,
+        otros_ingresos=otros,
+        gastos_totales=gastos_sin_deuda + servicio,
+        gasto_corriente=corriente,
+        gasto_capital=capital,
+        subsidios=subsidios,
+        servicio_deuda=servicio,
+        deficit=deficit_total,
+        deficit_primario=deficit_primario,
+        superavit_primario=-deficit_primario,
+        deuda_interna=deuda_interna,
+        deuda_externa=deuda_externa,
+        deuda_total=deuda_total,
+        ratio_deuda_pib=deuda_total * inv_pib,
+        ratio_deficit_pib=deficit_total * inv_pib
+    )
+
+
+def simular_trayectorias_gobierno(params,
+                                  deuda_interna,
+                                  deuda_externa,
+                                  pib,
+                                  precio_gas,
+                                  precio_minerales,
+                                  produccion_gas,
+                                  produccion_minerales,
+                                  tasa_interes_interna,
+                                  tasa_interes_externa,
+                                  shock_ingresos=0.0,
+                                  shock_gastos=0.0) -> PasoGobierno:
+    """
+    Encadena `paso_gobierno` sobre el eje temporal para muchos escenarios
+
+    Las variables del periodo llevan el tiempo en el primer eje, con forma
+    (T,) o (T, n_escenarios); las deudas iniciales son escalares o arreglos
+    (n_escenarios,). Sólo hay T iteraciones en Python, cada una resolviendo
+    todos los escenarios con ufuncs.
+
+    Returns:
+        PasoGobierno con arreglos de forma (T, n_escenarios) por campo
+    """
+    entradas = np.broadcast_arrays(
+        pib, precio_gas, precio_minerales, produccion_gas, produccion_minerales,
+        tasa_interes_interna, tasa_interes_externa, shock_ingresos, shock_gastos
+    )
+    salida = np.empty((len(PasoGobierno._fields),) + entradas[0].shape)
+    constantes = constantes_gobierno(params)
+
+    gasto_anterior = 0.0
+    for t in range(entradas[0].shape[0]):
+        paso = paso_gobierno(constantes, deuda_interna, deuda_externa, gasto_anterior,
+                             *(x[t] for x in entradas))
+        salida[:, t] = paso
+        deuda_interna, deuda_externa = paso.deuda_interna, paso.deuda_externa
+        gasto_anterior = paso.gastos_totales
+
+    return PasoGobierno(*salida)
+
+
 class AgenteGobierno:
     """
     Agente que representa al Gobierno
@@ -46,8 +326,10 @@ class AgenteGobierno:
     
     def __init__(self, parametros):
         self.params = parametros
+        # Constantes del paso; se recalculan sólo al crear el agente
+        self._constantes = constantes_gobierno(parametros)
         self.estado = EstadoGobierno()
-        self.historia = []
+        self.historia = Historial(PasoGobierno._fields)
         
     def calcular_ingresos(self, 
                          pib: float,
@@ -55,78 +337,42 @@ class AgenteGobierno:
                          precio_minerales: float,
                          produccion_gas: float,
                          produccion_minerales: float,
-                         shock: float = 0.0) -> Dict[str, float]:
+                         shock: float = 0.0) -> IngresosGobierno:
         """
         Calcula ingresos del gobierno
         
         I_total = I_tributarios + I_hidrocarburos + I_minerales + Otros
-        """
-        # Ingresos tributarios (función del PIB con elasticidad)
-        base_tributaria = pib * self.params.tasa_impositiva_base
-        ingresos_trib = base_tributaria * (1 + self.params.elasticidad_recaudacion_pib * 0.01)
-        
-        # Shock estocástico en recaudación
-        ingresos_trib *= (1 + shock)
-        
-        # Ingresos de hidrocarburos (regalías del gas)
-        ingresos_gas = (precio_gas * produccion_gas * 
-                       self.params.participacion_regalias_gas)
-        
-        # Ingresos de minerales
-        ingresos_minerales = (precio_minerales * produccion_minerales * 
-                             self.params.participacion_regalias_minerales)
         
-        # Otros ingresos (tasas, multas, etc.) - simplificado
-        otros_ingresos = pib * 0.02
-        
-        ingresos_totales = (ingresos_trib + ingresos_gas + 
-                           ingresos_minerales + otros_ingresos)
-        
-        return {
-            'tributarios': ingresos_trib,
-            'hidrocarburos': ingresos_gas,
-            'minerales': ingresos_minerales,
-            'otros': otros_ingresos,
-            'totales': ingresos_totales
-        }
+        Returns:
+            IngresosGobierno(tributarios, hidrocarburos, minerales, otros, totales)
+        """
+        return IngresosGobierno(*_ingresos(
+            pib, precio_gas, precio_minerales,
+            produccion_gas, produccion_minerales, shock,
+            self._constantes.tasa_tributaria_efectiva,
+            self._constantes.regalias_gas,
+            self._constantes.regalias_minerales
+        ))
     
     def calcular_gastos(self,
                        pib: float,
                        gasto_anterior: float,
                        demanda_social: float = 1.0,
-                       shock: float = 0.0) -> Dict[str, float]:
+                       shock: float = 0.0) -> GastosGobierno:
         """
         Calcula gastos del gobierno
         
         Modelo con inercia: G_t = α·G_{t-1} + (1-α)·G_base
-        """
-        # Gasto corriente (salarios, operación)
-        gasto_base_corriente = pib * self.params.gasto_corriente_base
-        
-        if gasto_anterior > 0:
-            # Inercia del gasto
-            gasto_corriente = (self.params.inercia_gasto * gasto_anterior * 0.8 + 
-                             (1 - self.params.inercia_gasto) * gasto_base_corriente)
-        else:
-            gasto_corriente = gasto_base_corriente
-        
-        # Shock estocástico
-        gasto_corriente *= (1 + shock)
-        
-        # Gasto de capital (inversión pública)
-        gasto_capital = pib * self.params.gasto_capital_base
-        
-        # Subsidios (combustibles, alimentos)
-        subsidios = pib * self.params.subsidios_base * demanda_social
         
-        gastos_totales = gasto_corriente + gasto_capital + subsidios
-        
-        return {
-            'corriente': gasto_corriente,
-            'capital': gasto_capital,
-            'subsidios': subsidios,
-            'totales_sin_deuda': gastos_totales
-        }
+        Returns:
+            GastosGobierno(corriente, capital, subsidios, totales_sin_deuda)
+        """
+        c = self._constantes
+        return GastosGobierno(*_gastos(
+            pib, gasto_anterior, demanda_social, shock,
+            c.gasto_corriente_base, c.gasto_capital_base, c.subsidios_base,
+            c.inercia, c.complemento_inercia
+        ))
     
     def calcular_servicio_deuda(self,
                                deuda_interna: float,
@@ -151,10 +397,7 @@ class AgenteGobierno:
         Returns:
             (deficit_total, deficit_primario)
         """
-        deficit_total = ingresos - (gastos + servicio_deuda)
-        deficit_primario = ingresos - gastos
-        
-        return deficit_total, deficit_primario
+        return _deficit(ingresos, gastos, servicio_deuda)
     
     def gestionar_financiamiento(self,
                                 deficit: float,
@@ -167,21 +410,9 @@ class AgenteGobierno:
         Returns:
             (nueva_deuda_interna, nueva_deuda_externa)
         """
-        if deficit >= 0:  # Superávit
-            return 0.0, 0.0
-        
-        # Monto a financiar
-        monto_deficit = abs(deficit)
-        
-        # Límite de déficit
-        deficit_maximo = pib * self.params.limite_deficit_pib
-        monto_a_financiar = min(monto_deficit, deficit_maximo)
-        
-        # Distribución entre deuda interna y externa
-        nueva_deuda_interna = monto_a_financiar * self.params.preferencia_deuda_interna
-        nueva_deuda_externa = monto_a_financiar * (1 - self.params.preferencia_deuda_interna)
-        
-        return nueva_deuda_interna, nueva_deuda_externa
+        c = self._constantes
+        return _financiamiento(deficit, pib, c.limite_deficit_pib,
+                               c.preferencia_interna, c.preferencia_externa)
     
     def actualizar_estado(self,
                          pib: float,
@@ -192,79 +423,32 @@ class AgenteGobierno:
                          tasa_interes_interna: float,
                          tasa_interes_externa: float,
                          shock_ingresos: float = 0.0,
-                         shock_gastos: float = 0.0) -> EstadoGobierno:
+                         shock_gastos: float = 0.0,
+                         t: int = None) -> EstadoGobierno:
         """
         Actualiza el estado completo del gobierno en un periodo
-        """
-        # 1. Calcular ingresos
-        ingresos = self.calcular_ingresos(
-            pib, precio_gas, precio_minerales,
-            produccion_gas, produccion_minerales,
-            shock_ingresos
-        )
         
-        # 2. Calcular gastos
-        gasto_anterior = self.estado.gastos_totales
-        gastos = self.calcular_gastos(
-            pib, gasto_anterior, 1.0, shock_gastos
-        )
-        
-        # 3. Calcular servicio de deuda
-        servicio = self.calcular_servicio_deuda(
+        Acepta escalares o arreglos de forma (n_escenarios,). `t` es la fila
+        de la historia a escribir (por defecto, el siguiente periodo).
+        """
+        paso = paso_gobierno(
+            self._constantes,
             self.estado.deuda_interna,
             self.estado.deuda_externa,
-            tasa_interes_interna,
-            tasa_interes_externa
-        )
-        
-        # 4. Calcular déficit
-        deficit_total, deficit_primario = self.calcular_deficit(
-            ingresos['totales'],
-            gastos['totales_sin_deuda'],
-            servicio
-        )
-        
-        # 5. Financiamiento
-        nueva_deuda_int, nueva_deuda_ext = self.gestionar_financiamiento(
-            deficit_total, pib,
-            tasa_interes_interna, tasa_interes_externa
+            self.estado.gastos_totales,
+            pib, precio_gas, precio_minerales,
+            produccion_gas, produccion_minerales,
+            tasa_interes_interna, tasa_interes_externa,
+            shock_ingresos, shock_gastos
         )
-        
-        # 6. Actualizar deudas
-        deuda_interna = self.estado.deuda_interna + nueva_deuda_int
-        deuda_externa = self.estado.deuda_externa + nueva_deuda_ext
-        deuda_total = deuda_interna + deuda_externa
-        
-        # 7. Actualizar estado
-        self.estado.ingresos_totales = ingresos['totales']
-        self.estado.ingresos_tributarios = ingresos['tributarios']
-        self.estado.ingresos_hidrocarburos = ingresos['hidrocarburos']
-        self.estado.ingresos_minerales = ingresos['minerales']
-        self.estado.otros_ingresos = ingresos['otros']
-        
-        self.estado.gastos_totales = gastos['totales_sin_deuda'] + servicio
-        self.estado.gasto_corriente = gastos['corriente']
-        self.estado.gasto_capital = gastos['capital']
-        self.estado.subsidios = gastos['subsidios']
-        self.estado.servicio_deuda = servicio
-        
-        self.estado.deficit = deficit_total
-        self.estado.deficit_primario = deficit_primario
-        self.estado.superavit_primario = -deficit_primario
-        
-        self.estado.deuda_interna = deuda_interna
-        self.estado.deuda_externa = deuda_externa
-        self.estado.deuda_total = deuda_total
-        
-        self.estado.ratio_deuda_pib = deuda_total / pib if pib > 0 else 0
-        self.estado.ratio_deficit_pib = deficit_total / pib if pib > 0 else 0
+        self.estado = EstadoGobierno(*paso)
         
         # Guardar en historia
-        self.historia.append(self.estado.__dict__.copy())
+        self.historia.registrar(paso, t)
         
         return self.estado
     
-    def evaluar_sostenibilidad(self, pib: float, tasa_crecimiento: float) -> Dict:
+    def evaluar_sostenibilidad(self, pib: float, tasa_crecimiento: float) -> SostenibilidadFiscal:
         """
         Evalúa la sostenibilidad fiscal
         
@@ -273,8 +457,10 @@ class AgenteGobierno:
         - Carga de intereses
         - Balance primario requerido
         """
-        r = (self.estado.servicio_deuda / self.estado.deuda_total 
-             if self.estado.deuda_total > 0 else 0)  # Tasa efectiva
+        deuda_divisor = np.where(self.estado.deuda_total > 0, self.estado.deuda_total, np.inf)
+        inv_pib = 1.0 / np.where(pib > 0, pib, np.inf)
+        
+        r = self.estado.servicio_deuda / deuda_divisor  # Tasa efectiva
         g = tasa_crecimiento  # Crecimiento del PIB
         
         # Balance primario necesario para estabilizar deuda
@@ -282,16 +468,26 @@ class AgenteGobierno:
         sp_requerido = (r - g) * self.estado.ratio_deuda_pib
         
         # Margen fiscal
-        margen = self.estado.superavit_primario / pib - sp_requerido
+        balance_actual = self.estado.superavit_primario * inv_pib
+        margen = balance_actual - sp_requerido
+        
+        return SostenibilidadFiscal(
+            ratio_deuda_pib=self.estado.ratio_deuda_pib,
+            carga_intereses=self.estado.servicio_deuda * inv_pib,
+            balance_primario_requerido=sp_requerido,
+            balance_primario_actual=balance_actual,
+            margen_fiscal=margen,
+            sostenible=margen >= 0
+        )
+    
+    def reservar_historia(self, num_periodos: int, ruta_memmap=None, tipo=None):
+        """
+        Preasigna la historia para un horizonte de `num_periodos`
         
-        return {
-            'ratio_deuda_pib': self.estado.ratio_deuda_pib,
-            'carga_intereses': self.estado.servicio_deuda / pib if pib > 0 else 0,
-            'balance_primario_requerido': sp_requerido,
-            'balance_primario_actual': self.estado.superavit_primario / pib if pib > 0 else 0,
-            'margen_fiscal': margen,
-            'sostenible': margen >= 0
-        }
+        Con `ruta_memmap` la historia se respalda en ese archivo (np.memmap);
+        `tipo` fija su precisión (ver `Historial`).
+        """
+        self.historia.reservar(num_periodos, ruta_memmap, tipo)
     
     def reset(self, deuda_interna_inicial: float, deuda_externa_inicial: float):
         """Reinicia el estado del gobierno"""
@@ -299,4 +495,4 @@ class AgenteGobierno:
         self.estado.deuda_interna = deuda_interna_inicial
         self.estado.deuda_externa = deuda_externa_inicial
         self.estado.deuda_total = deuda_interna_inicial + deuda_externa_inicial
-        self.historia = []
\ No newline at end of file
+        self.historia.vaciar()
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Historia por periodo de los agentes en un buffer NumPy preasignado
+"""
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+
+
+class Historial:
+    """
+    Guarda el estado de cada periodo en un arreglo (T, n_escenarios, n_campos)
+
+    Cada registro copia los valores del periodo en una fila del buffer en
+    lugar de crear un diccionario por periodo. Si el horizonte no se reservó
+    de antemano, la capacidad se duplica al llenarse.
+
+    Con `ruta_memmap` el buffer es un `np.memmap` sobre ese archivo: para
+    horizontes o lotes de escenarios muy grandes sólo las páginas en uso
+    ocupan memoria y el sistema operativo se encarga del resto.
+    
+    `tipo` fija la precisión del buffer ('f8' por defecto); con 'f4' la
+    historia ocupa la mitad, a costa de guardar ~7 cifras significativas.
+    """
+
+    def __init__(self, campos: Sequence[str], num_periodos: int = 0,
+                 ruta_memmap: Optional[Union[str, Path]] = None,
+                 tipo: Union[str, np.dtype] = 'f8'):
+        self.campos: Tuple[str, ...] = tuple(campos)
+        self._fijar_tipo(tipo)
+        self.ruta_memmap = ruta_memmap
+        self._capacidad = num_periodos
+        self._buffer: Optional[np.ndarray] = None
+        self._num_periodos = 0
+
+    def reservar(self, num_periodos: int,
+                 ruta_memmap: Optional[Union[str, Path]] = None,
+                 tipo: Optional[Union[str, np.dtype]] = None):
+        """
+        Fija la capacidad para un horizonte conocido y vacía la historia
+
+        Args:
+            num_periodos: horizonte esperado
+            ruta_memmap: archivo para respaldar el buffer en disco (opcional)
+            tipo: precisión del buffer (opcional, por defecto la actual)
+        """
+        self._capacidad = num_periodos
+        if ruta_memmap is not None:
+            self.ruta_memmap = ruta_memmap
+        if tipo is not None:
+            self._fijar_tipo(tipo)
+        self.vaciar()
+
+    def _fijar_tipo(self, tipo: Union[str, np.dtype]):
+        """Precisión de los valores y dtype estructurado equivalente"""
+        self.tipo = np.dtype(tipo)
+        self.dtype = np.dtype([(campo, self.tipo) for campo in self.campos])
+
+    def vaciar(self):
+        """Descarta los periodos registrados conservando la capacidad"""
+        self._buffer = None
+        self._num_periodos = 0
+
+    def registrar(self, valores: Sequence, t: Optional[int] = None):
+        """
+        Escribe los valores de un periodo (escalares o arreglos por escenario)
+
+        Args:
+            valores: un valor por campo, en el orden de `campos`, o un
+                arreglo (n_campos, n_escenarios)
+            t: índice del periodo (por defecto, el siguiente); los periodos
+                saltados quedan en NaN
+
+        Raises:
+            ValueError: si cambia el número de escenarios con periodos ya
+                registrados
+        """
+        if t is None:
+            t = self._num_periodos
+
+        if isinstance(valores, np.ndarray) and valores.ndim == 2:
+            fila = valores.T  # estado ya empaquetado como (n_campos, n_escenarios)
+        else:
+            fila = np.column_stack(valores)  # (n_escenarios, n_campos)
+
+        if self._buffer is not None and self._buffer.shape[1] != fila.shape[0]:
+            if self._num_periodos:
+                raise ValueError(
+                    f"El periodo tiene {fila.shape[0]} escenarios y la historia "
+                    f"{self._buffer.shape[1]}; use vaciar() antes de cambiarlos"
+                )
+            self._buffer = None
+
+        if self._buffer is None:
+            self._buffer = self._nuevo_buffer((max(self._capacidad, t + 1),) + fila.shape)
+        elif t >= len(self._buffer):
+            anterior = np.array(self._buffer[:self._num_periodos])
+            self._buffer = None  # libera el mapeo antes de reescribir el archivo
+            self._buffer = self._nuevo_buffer(
+                (max(2 * len(anterior), t + 1),) + fila.shape
+            )
+            self._buffer[:len(anterior)] = anterior
+
+        if t > self._num_periodos:
+            self._buffer[self._num_periodos:t] = np.nan  # periodos saltados
+        self._buffer[t] = fila
+        self._num_periodos = max(self._num_periodos, t + 1)
+
+    def _nuevo_buffer(self, forma: Tuple[int, ...]) -> np.ndarray:
+        """
+        Buffer en memoria (con NaN) o, si hay ruta, mapeado sobre el archivo
+
+        En el memmap no se rellena nada para no tocar páginas sin usar; los
+        periodos saltados se marcan con NaN al registrar.
+        """
+        if self.ruta_memmap is None:
+            return np.full(forma, np.nan, dtype=self.tipo)
+        return np.memmap(self.ruta_memmap, dtype=self.tipo, mode='w+', shape=forma)
+
+    def flush(self):
+        """Escribe a disco los periodos pendientes si el buffer es un memmap"""
+        if isinstance(self._buffer, np.memmap):
+            self._buffer.flush()
+
+    def __len__(self) -> int:
+        return self._num_periodos
+
+    def como_arreglo(self) -> np.ndarray:
+        """Vista (T, n_escenarios, n_campos) de los periodos registrados"""
+        if self._buffer is None:
+            return np.empty((0, 1, len(self.campos)), dtype=self.tipo)
+        return self._buffer[:self._num_periodos]
+
+    def como_registros(self) -> np.ndarray:
+        """
+        Vista como arreglo estructurado (un registro por periodo y escenario)
+
+        No copia datos: reinterpreta cada fila del buffer con `dtype`.
+        """
+        if not self.campos:  # sin campos no hay nada que reinterpretar
+            return np.empty(0, dtype=self.dtype)
+        arreglo = self.como_arreglo()
+        return arreglo.reshape(-1, len(self.campos)).view(self.dtype).ravel()
+
+    def como_dataframe(self) -> pd.DataFrame:
+        """
+        DataFrame con una fila por periodo (y por escenario si hay varios)
+        """
+        if not self.campos:
+            return pd.DataFrame()
+        arreglo = self.como_arreglo()
+        num_periodos, num_escenarios, _ = arreglo.shape
+
+        df = pd.DataFrame(arreglo.reshape(-1, len(self.campos)), columns=list(self.campos))
+        if num_escenarios > 1:
+            df.insert(0, 'escenario', np.tile(np.arange(num_escenarios), num_periodos))
+            df.insert(0, 'periodo', np.repeat(np.arange(num_periodos), num_escenarios))
+        return df
@@ -5,8 +5,9 @@ Versión minimal: describe el consumo y los impuestos indirectos asociados.
 """
 
 from dataclasses import dataclass
+from typing import Tuple
 
-@dataclass
+@dataclass(slots=True)
 class Hogares:
     propension_consumo: float = 0.7      # % del ingreso que se consume
     tasa_impuesto_indirecto: float = 0.13  # IVA u otros
@@ -15,5 +16,9 @@ class Hogares:
         return ingreso_disponible * self.propension_consumo
 
     def impuestos_indirectos(self, ingreso_disponible: float) -> float:
-        cons = self.consumo(ingreso_disponible)
-        return cons * self.tasa_impuesto_indirecto
+        return self.consumo_e_impuestos(ingreso_disponible)[1]
+
+    def consumo_e_impuestos(self, ingreso_disponible: float) -> Tuple[float, float]:
+        """Consumo e impuestos indirectos en una sola pasada."""
+        cons = ingreso_disponible * self.propension_consumo
+        return cons, cons * self.tasa_impuesto_indirecto
@@ -4,7 +4,7 @@ Sector externo: exportaciones, importaciones y cuenta corriente simplificada.
 
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class SectorExterno:
     def balanza_comercial(self, exportaciones: float, importaciones: float) -> float:
         """Exportaciones - Importaciones."""
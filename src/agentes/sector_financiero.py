@@ -2,12 +2,17 @@
 Sector financiero: determina tasa de interés efectiva para la deuda.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SectorFinanciero:
     tasa_base_internacional: float = 0.02   # 2%
     prima_riesgo: float = 0.03              # 3%
+    tasa_efectiva: float = field(init=False, repr=False)  # base + prima, fija
+
+    def __post_init__(self):
+        object.__setattr__(self, 'tasa_efectiva',
+                           self.tasa_base_internacional + self.prima_riesgo)
 
     def tasa_interes_efectiva(self) -> float:
-        return self.tasa_base_internacional + self.prima_riesgo
+        return self.tasa_efectiva
@@ -1,21 +1,35 @@
 """
 Versión determinística del modelo: mismas ecuaciones, sin shocks aleatorios.
 """
-
 import pandas as pd
-from .parametros import ParametrosMacroeconomicos, ParametrosDeuda
-
-def simular_deterministico(
-    macro: ParametrosMacroeconomicos,
-    deuda: ParametrosDeuda,
-) -> pd.DataFrame:
-    # Aquí puedes llamar una versión de las ecuaciones sin ruido
-    # o usar tu modelo_estocastico con volatilidades = 0
-    # Para no complicar, hacemos un dummy que devuelve algo coherente.
-    from .modelo_estocastico import simular_escenario_estocastico
-
-    return simular_escenario_estocastico(
-        macro=macro,
-        deuda=deuda,
-        volatilidad_cero=True  # si agregas ese flag en el modelo estocástico
-    )
+
+from ..agentes.empresas import AgenteEmpresas
+from ..agentes.gobierno import AgenteGobierno
+from .modelo_estocastico import ModeloEstocastico
+
+
+def simular_deterministico(configuracion, num_periodos: int = None) -> pd.DataFrame:
+    """
+    Simula la trayectoria central del modelo (todos los shocks en cero)
+
+    Desactiva la distribución de shocks en una copia de la configuración,
+    de modo que ningún periodo genera números aleatorios; las ecuaciones son
+    las mismas de ModeloEstocastico.
+
+    Args:
+        configuracion: ConfiguracionModelo de referencia (no se modifica)
+        num_periodos: número de trimestres (por defecto, el horizonte configurado)
+
+    Returns:
+        DataFrame con la trayectoria determinística
+    """
+    config = configuracion.copiar()
+    config.simulacion.tipo_distribucion_shocks = "determinista"
+
+    agentes = {
+        'gobierno': AgenteGobierno(config.gobierno),
+        'empresas': AgenteEmpresas(config.empresas)
+    }
+
+    modelo = ModeloEstocastico(config, agentes)
+    return modelo.simular(num_periodos)
@@ -1,43 +1,141 @@
 """
 Modelo Estocástico de Déficit Fiscal y Deuda Pública
+
+Las variables continuas del estado son filas de un arreglo (campos,
+num_simulaciones): cada periodo avanza todas las trayectorias a la vez con
+operaciones NumPy.
 """
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from functools import partial
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
 
+from ..agentes.historial import Historial
 
-@dataclass
-class EstadoEconomia:
-    """Estado agregado de la economía"""
-    periodo: int = 0
-    año: int = 2020
-    trimestre: int = 1
-    
+
+# Tendencias anuales de los precios internacionales
+DRIFT_GAS = 0.02
+DRIFT_MINERALES = 0.01
+
+
+# Variables continuas del estado (una fila por campo) y sus valores por defecto
+VALORES_POR_DEFECTO = {
     # Variables macroeconómicas
-    pib: float = 0.0
-    tasa_crecimiento_pib: float = 0.0
-    inflacion: float = 0.0
-    tipo_cambio: float = 6.96
-    reservas_internacionales: float = 0.0
+    'pib': 0.0,
+    'tasa_crecimiento_pib': 0.0,
+    'inflacion': 0.0,
+    'tipo_cambio': 6.96,
+    'reservas_internacionales': 0.0,
     
     # Precios internacionales
-    precio_gas: float = 50.0
-    precio_minerales: float = 2500.0
+    'precio_gas': 50.0,
+    'precio_minerales': 2500.0,
     
     # Producción
-    produccion_gas: float = 100.0
-    produccion_minerales: float = 100.0
+    'produccion_gas': 100.0,
+    'produccion_minerales': 100.0,
     
     # Tasas de interés
-    tasa_interes_domestica: float = 0.06
-    tasa_interes_internacional: float = 0.04
+    'tasa_interes_domestica': 0.06,
+    'tasa_interes_internacional': 0.04,
     
     # Sector real
-    consumo: float = 0.0
-    inversion: float = 0.0
-    exportaciones: float = 0.0
-    importaciones: float = 0.0
+    'consumo': 0.0,
+    'inversion': 0.0,
+    'exportaciones': 0.0,
+    'importaciones': 0.0,
+}
+
+CAMPOS_CONTINUOS = tuple(VALORES_POR_DEFECTO)
+INDICE_CAMPOS = {campo: i for i, campo in enumerate(CAMPOS_CONTINUOS)}
+
+
+class EstadoEconomia:
+    """
+    Estado agregado de la economía
+    
+    El calendario es común a todas las simulaciones. Las variables continuas
+    viven en un único arreglo `datos` de forma (campos, num_simulaciones);
+    cada atributo (`pib`, `precio_gas`, ...) es una vista de su fila y
+    asignarlo copia los valores dentro del arreglo.
+    """
+    __slots__ = ('periodo', 'año', 'trimestre', 'datos')
+    
+    def __init__(self,
+                 num_simulaciones: int = 1,
+                 periodo: int = 0,
+                 año: int = 2020,
+                 trimestre: int = 1,
+                 **valores: float):
+        self.periodo = periodo
+        self.año = año
+        self.trimestre = trimestre
+        self.datos = np.empty((len(CAMPOS_CONTINUOS), num_simulaciones))
+        
+        for campo, defecto in VALORES_POR_DEFECTO.items():
+            setattr(self, campo, valores.pop(campo, defecto))
+        if valores:
+            raise TypeError(f"Campos de estado desconocidos: {sorted(valores)}")
+
+
+def _fila_estado(indice: int) -> property:
+    """Propiedad que lee y escribe la fila `indice` de EstadoEconomia.datos"""
+    def leer(self) -> np.ndarray:
+        return self.datos[indice]
+    
+    def escribir(self, valor):
+        self.datos[indice] = valor
+    
+    return property(leer, escribir)
+
+
+for _indice, _campo in enumerate(CAMPOS_CONTINUOS):
+    setattr(EstadoEconomia, _campo, _fila_estado(_indice))
+
+
+# Orden de los shocks en el arreglo de `generar_shocks`
+NOMBRES_SHOCKS = ('precio_gas', 'precio_minerales', 'pib',
+                  'ingresos', 'gastos', 'tipo_cambio')
+
+
+def calendario(periodo, año_inicio: int):
+    """
+    Año y trimestre al cabo de `periodo` trimestres desde el inicio
+    
+    Acepta un entero o un arreglo de periodos.
+    """
+    return año_inicio + periodo // 4, periodo % 4 + 1
+
+
+class _GobiernoNulo:
+    """
+    Gobierno sin actividad fiscal: déficit y deuda nulos en todo periodo
+    
+    Sustituye al agente cuando el modelo se crea sin gobierno, de modo que
+    las ecuaciones del periodo no necesitan comprobar si existe. Sólo las
+    reservas, que sin gobierno quedan fijas, lo comprueban una vez por
+    periodo.
+    """
+    
+    def __init__(self, num_simulaciones: int):
+        ceros = np.zeros(num_simulaciones)
+        self.estado = SimpleNamespace(
+            deficit=ceros,
+            ratio_deuda_pib=ceros,
+            ratio_deficit_pib=ceros,
+            deuda_externa=ceros
+        )
+        self.historia = Historial(())
+    
+    def reset(self, deuda_interna: float, deuda_externa: float):
+        pass
+    
+    def actualizar_estado(self, **kwargs):
+        pass
+    
+    def reservar_historia(self, num_periodos: int, ruta_memmap=None, tipo=None):
+        pass
 
 
 class ModeloEstocastico:
@@ -52,119 +150,186 @@ class ModeloEstocastico:
     - Sector externo (precios, tipo de cambio)
     """
     
-    def __init__(self, configuracion, agentes: Dict):
+    def __init__(self, configuracion, agentes: Dict, num_simulaciones: int = 1):
         self.config = configuracion
+        self.num_simulaciones = num_simulaciones
         self.params_sim = configuracion.simulacion
         self.params_macro = configuracion.macroeconomicos
         
         # Agentes
-        self.gobierno = agentes.get('gobierno')
+        self._con_gobierno = bool(agentes.get('gobierno'))
+        self.gobierno = agentes.get('gobierno') or _GobiernoNulo(num_simulaciones)
         self.empresas = agentes.get('empresas')
         self.hogares = agentes.get('hogares')
         self.sector_financiero = agentes.get('sector_financiero')
         self.sector_externo = agentes.get('sector_externo')
         
         # Estado
-        self.estado = EstadoEconomia()
-        self.historia = []
+        self.estado = EstadoEconomia(num_simulaciones)
+        self.historia = Historial(CAMPOS_CONTINUOS)
+        # Fila auxiliar: los `actualizar_*` escriben en el estado sin temporales
+        self._temporal = np.empty(num_simulaciones)
+        
+        # Columnas de resultados: estado seguido de las del gobierno con prefijo
+        self._columnas = list(CAMPOS_CONTINUOS)
+        self._columnas += [f'gob_{campo}' for campo in self.gobierno.historia.campos]
         
         # Generador de números aleatorios
-        self.rng = np.random.RandomState(self.params_sim.semilla_aleatoria)
+        self.rng = np.random.default_rng(self.params_sim.semilla_aleatoria)
+        self._shocks = None
+        self._resultados: Optional[pd.DataFrame] = None
+        self._preparar_parametros()
         
     def inicializar(self):
         """Inicializa el modelo con valores iniciales"""
-        self.estado.periodo = 0
-        self.estado.año = self.params_sim.año_inicio
-        self.estado.trimestre = 1
+        self.estado = EstadoEconomia(
+            self.num_simulaciones,
+            periodo=0,
+            año=self.params_sim.año_inicio,
+            trimestre=1,
+            
+            # Valores iniciales macroeconómicos
+            pib=self.params_macro.pib_inicial,
+            inflacion=self.params_macro.inflacion_inicial,
+            reservas_internacionales=self.params_macro.reservas_iniciales,
+            
+            # Precios iniciales
+            precio_gas=self.config.sector_externo.precio_gas_base,
+            precio_minerales=self.config.sector_externo.precio_zinc_base,
+            
+            # Producción inicial
+            produccion_gas=self.config.empresas.produccion_gas_base,
+            produccion_minerales=self.config.empresas.produccion_minerales_base,
+            
+            # Tasas de interés
+            tasa_interes_domestica=self.config.sector_financiero.tasa_interes_domestica_base,
+            tasa_interes_internacional=self.config.sector_externo.tasa_libor_base
+        )
         
-        # Valores iniciales macroeconómicos
-        self.estado.pib = self.params_macro.pib_inicial
-        self.estado.inflacion = self.params_macro.inflacion_inicial
-        self.estado.reservas_internacionales = self.params_macro.reservas_iniciales
+        self._preparar_parametros()
         
-        # Precios iniciales
-        self.estado.precio_gas = self.config.sector_externo.precio_gas_base
-        self.estado.precio_minerales = self.config.sector_externo.precio_zinc_base
+        # Inicializar gobierno
+        self.gobierno.reset(
+            self.params_macro.deuda_inicial_interna,
+            self.params_macro.deuda_inicial_externa
+        )
+        
+        self.historia.vaciar()
+        self._shocks = None
+        self._resultados = None
         
-        # Producción inicial
-        self.estado.produccion_gas = self.config.empresas.produccion_gas_base
-        self.estado.produccion_minerales = self.config.empresas.produccion_minerales_base
+    def _preparar_parametros(self):
+        """
+        Copia a atributos planos los parámetros que usan los `actualizar_*`
         
-        # Tasas de interés
-        self.estado.tasa_interes_domestica = self.config.sector_financiero.tasa_interes_domestica_base
-        self.estado.tasa_interes_internacional = self.config.sector_externo.tasa_libor_base
+        Se ejecuta al crear el modelo y en cada `inicializar`, de modo que
+        los cambios de configuración previos a una simulación se respetan.
+        """
+        ext = self.config.sector_externo
         
-        # Inicializar gobierno
-        if self.gobierno:
-            self.gobierno.reset(
-                self.params_macro.deuda_inicial_interna,
-                self.params_macro.deuda_inicial_externa
-            )
+        # Deriva logarítmica por trimestre: μ·dt − σ²/2 (sin shocks, σ = 0)
+        medio_sigma2 = 0.5 if self._preparar_shocks() else 0.0
+        self._log_drift_gas = DRIFT_GAS / 4 - medio_sigma2 * ext.volatilidad_gas ** 2
+        self._log_drift_minerales = (DRIFT_MINERALES / 4 -
+                                     medio_sigma2 * ext.volatilidad_minerales ** 2)
+        self._log_drift_tipo_cambio = -medio_sigma2 * ext.volatilidad_tipo_cambio ** 2
         
-        self.historia = []
+        self._crecimiento_trimestral = self.params_macro.tasa_crecimiento_potencial / 4
+        self._reservas_minimas = self.params_macro.nivel_minimo_reservas
         
-    def generar_shocks(self) -> Dict[str, float]:
+        # Tasa internacional base + spread de riesgo país
+        self._tasa_sin_primas = (ext.tasa_libor_base +
+                                 self.config.sector_financiero.spread_riesgo_pais_base)
+    
+    def _desviaciones_shocks(self) -> np.ndarray:
+        """Desviación estándar de cada shock, en el orden de NOMBRES_SHOCKS"""
+        return np.array([
+            self.config.sector_externo.volatilidad_gas,
+            self.config.sector_externo.volatilidad_minerales,
+            0.02,  # PIB
+            self.config.gobierno.shock_recaudacion_std,
+            self.config.gobierno.shock_gasto_std,
+            self.config.sector_externo.volatilidad_tipo_cambio
+        ])
+    
+    def _preparar_shocks(self) -> bool:
         """
-        Genera shocks estocásticos para el periodo
+        Fija el sorteo y la escala de los shocks según la distribución
+        
+        La distribución no cambia durante una simulación, así que la elección
+        y la corrección de varianza de la t-student se hacen una sola vez.
         
-        Usa distribución normal o t-student según configuración
+        Returns:
+            False si la configuración desactiva los shocks
         """
-        if self.params_sim.tipo_distribucion_shocks == "normal":
-            shock_precio_gas = self.rng.normal(
-                0, self.config.sector_externo.volatilidad_gas
-            )
-            shock_precio_minerales = self.rng.normal(
-                0, self.config.sector_externo.volatilidad_minerales
-            )
-            shock_pib = self.rng.normal(0, 0.02)
-            shock_ingresos = self.rng.normal(
-                0, self.config.gobierno.shock_recaudacion_std
-            )
-            shock_gastos = self.rng.normal(
-                0, self.config.gobierno.shock_gasto_std
-            )
-            shock_tipo_cambio = self.rng.normal(
-                0, self.config.sector_externo.volatilidad_tipo_cambio
-            )
-            
-        elif self.params_sim.tipo_distribucion_shocks == "t-student":
+        tipo = self.params_sim.tipo_distribucion_shocks
+        self._escala_shocks = self._desviaciones_shocks()[:, None]
+        
+        # Factor de Cholesky de la correlación entre los precios de gas y minerales
+        rho = self.config.sector_externo.correlacion_precios
+        self._cholesky_precios = np.linalg.cholesky([[1.0, rho], [rho, 1.0]])
+        
+        if tipo == "normal":
+            self._sortear_shocks = self.rng.standard_normal
+        elif tipo == "t-student":
             df = self.params_sim.grados_libertad_t
-            shock_precio_gas = self.rng.standard_t(df) * self.config.sector_externo.volatilidad_gas / np.sqrt(df/(df-2))
-            shock_precio_minerales = self.rng.standard_t(df) * self.config.sector_externo.volatilidad_minerales / np.sqrt(df/(df-2))
-            shock_pib = self.rng.standard_t(df) * 0.02 / np.sqrt(df/(df-2))
-            shock_ingresos = self.rng.standard_t(df) * self.config.gobierno.shock_recaudacion_std / np.sqrt(df/(df-2))
-            shock_gastos = self.rng.standard_t(df) * self.config.gobierno.shock_gasto_std / np.sqrt(df/(df-2))
-            shock_tipo_cambio = self.rng.standard_t(df) * self.config.sector_externo.volatilidad_tipo_cambio / np.sqrt(df/(df-2))
+            self._sortear_shocks = partial(self.rng.standard_t, df)
+            self._escala_shocks = self._escala_shocks / np.sqrt(df/(df-2))
         else:
             # Sin shocks
-            return {k: 0.0 for k in ['precio_gas', 'precio_minerales', 'pib', 
-                                     'ingresos', 'gastos', 'tipo_cambio']}
-        
-        return {
-            'precio_gas': shock_precio_gas,
-            'precio_minerales': shock_precio_minerales,
-            'pib': shock_pib,
-            'ingresos': shock_ingresos,
-            'gastos': shock_gastos,
-            'tipo_cambio': shock_tipo_cambio
-        }
+            self._sortear_shocks = None
+        
+        return self._sortear_shocks is not None
+    
+    def reiniciar_generador(self, semilla):
+        """
+        Reinicia el generador aleatorio con `semilla` (entero o SeedSequence)
+        
+        Los shocks sorteados después son los mismos que los de un modelo
+        nuevo creado con esa semilla en la configuración.
+        """
+        self.rng = np.random.default_rng(semilla)
+        self._preparar_shocks()
+    
+    def generar_shocks(self, num_periodos: int = 1) -> np.ndarray:
+        """
+        Genera los shocks estocásticos de `num_periodos` trimestres
+        
+        Usa distribución normal o t-student (reescalada a la misma varianza)
+        según configuración. Todos los shocks salen de una sola llamada al
+        generador; los de precios se correlacionan con `correlacion_precios`.
+        
+        Returns:
+            Arreglo (num_periodos, len(NOMBRES_SHOCKS), num_simulaciones)
+        """
+        forma = (num_periodos, len(NOMBRES_SHOCKS), self.num_simulaciones)
+        if self._sortear_shocks is None:
+            return np.zeros(forma)
+        
+        shocks = self._sortear_shocks(size=forma)
+        shocks[:, :2] = self._cholesky_precios @ shocks[:, :2]
+        shocks *= self._escala_shocks
+        return shocks
     
     def actualizar_precios_internacionales(self, shocks: Dict):
         """
         Actualiza precios internacionales con procesos estocásticos
         
-        Usa Geometric Brownian Motion (GBM):
-        dS = μ·S·dt + σ·S·dW
+        Usa Geometric Brownian Motion (GBM), dS = μ·S·dt + σ·S·dW, con su
+        solución exacta por trimestre:
+        S_{t+1} = S_t · exp((μ·dt − σ²/2) + σ·Z)
+        
+        Los precios se mantienen positivos sin necesidad de pisos.
         """
-        # Precio del gas
-        drift_gas = 0.02  # 2% tendencia anual
-        self.estado.precio_gas *= (1 + drift_gas/4 + shocks['precio_gas'])
-        self.estado.precio_gas = max(self.estado.precio_gas, 20.0)  # Piso
+        factor = self._temporal
+        
+        np.add(self._log_drift_gas, shocks['precio_gas'], out=factor)
+        np.exp(factor, out=factor)
+        np.multiply(self.estado.precio_gas, factor, out=self.estado.precio_gas)
         
-        # Precio de minerales
-        drift_minerales = 0.01
-        self.estado.precio_minerales *= (1 + drift_minerales/4 + shocks['precio_minerales'])
-        self.estado.precio_minerales = max(self.estado.precio_minerales, 1000.0)
+        np.add(self._log_drift_minerales, shocks['precio_minerales'], out=factor)
+        np.exp(factor, out=factor)
+        np.multiply(self.estado.precio_minerales, factor, out=self.estado.precio_minerales)
         
     def actualizar_pib(self, shocks: Dict):
         """
@@ -172,28 +337,29 @@ class ModeloEstocastico:
         
         PIB_t = PIB_{t-1} · (1 + g + shock)
         """
-        tasa_crecimiento = (self.params_macro.tasa_crecimiento_potencial / 4 + 
-                           shocks['pib'])
+        tasa_crecimiento = self.estado.tasa_crecimiento_pib  # vista de la fila
+        np.add(self._crecimiento_trimestral, shocks['pib'], out=tasa_crecimiento)
         
-        self.estado.pib *= (1 + tasa_crecimiento)
-        self.estado.tasa_crecimiento_pib = tasa_crecimiento * 4  # Anualizado
+        factor = np.add(tasa_crecimiento, 1, out=self._temporal)
+        np.multiply(self.estado.pib, factor, out=self.estado.pib)
+        tasa_crecimiento *= 4  # Anualizado
         
     def actualizar_tipo_cambio(self, shocks: Dict):
         """Actualiza tipo de cambio"""
         # En Bolivia hay tipo de cambio relativamente fijo
         # pero puede haber presiones por déficit y reservas
         
-        presion_deficit = 0.0
-        if self.gobierno:
-            if self.gobierno.estado.deficit < 0:
-                presion_deficit = 0.005
+        # Forma logarítmica, como los precios: positivo para cualquier shock
+        factor = np.add(self._log_drift_tipo_cambio, shocks['tipo_cambio'],
+                        out=self._temporal)
         
-        presion_reservas = 0.0
-        if self.estado.reservas_internacionales < self.params_macro.nivel_minimo_reservas:
-            presion_reservas = 0.01
+        # Presión por déficit y por reservas bajo el mínimo
+        np.add(factor, 0.005, out=factor, where=self.gobierno.estado.deficit < 0)
+        np.add(factor, 0.01, out=factor,
+               where=self.estado.reservas_internacionales < self._reservas_minimas)
         
-        self.estado.tipo_cambio *= (1 + shocks['tipo_cambio'] + 
-                                   presion_deficit + presion_reservas)
+        np.exp(factor, out=factor)
+        np.multiply(self.estado.tipo_cambio, factor, out=self.estado.tipo_cambio)
         
     def actualizar_tasas_interes(self):
         """
@@ -201,30 +367,21 @@ class ModeloEstocastico:
         
         r_domestica = r_internacional + spread + prima_riesgo
         """
-        # Tasa internacional base
-        tasa_base = self.config.sector_externo.tasa_libor_base
-        
-        # Spread base
-        spread = self.config.sector_financiero.spread_riesgo_pais_base
+        tasa = self.estado.tasa_interes_domestica  # vista de la fila
+        prima = self._temporal
         
         # Prima de riesgo por nivel de deuda
-        if self.gobierno:
-            ratio_deuda = self.gobierno.estado.ratio_deuda_pib
-            if ratio_deuda > 0.5:
-                prima_deuda = (ratio_deuda - 0.5) * 0.1
-            else:
-                prima_deuda = 0.0
-            
-            # Prima por déficit
-            ratio_deficit = abs(self.gobierno.estado.ratio_deficit_pib)
-            prima_deficit = ratio_deficit * 0.5
-        else:
-            prima_deuda = 0.0
-            prima_deficit = 0.0
+        np.subtract(self.gobierno.estado.ratio_deuda_pib, 0.5, out=prima)
+        np.maximum(prima, 0.0, out=prima)
+        prima *= 0.1
+        np.add(self._tasa_sin_primas, prima, out=tasa)
         
-        self.estado.tasa_interes_domestica = (tasa_base + spread + 
-                                              prima_deuda + prima_deficit)
-        self.estado.tasa_interes_domestica = min(self.estado.tasa_interes_domestica, 0.20)
+        # Prima por déficit
+        np.abs(self.gobierno.estado.ratio_deficit_pib, out=prima)
+        prima *= 0.5
+        tasa += prima
+        
+        np.minimum(tasa, 0.20, out=tasa)
         
     def actualizar_reservas(self):
         """
@@ -232,31 +389,31 @@ class ModeloEstocastico:
         
         ΔR = Exportaciones - Importaciones + Flujo_Capital - Servicio_Deuda_Externa
         """
-        if not self.gobierno:
-            return
-        
-        # Simplificado: las reservas caen con déficit y servicio de deuda externa
-        deficit = self.gobierno.estado.deficit
-        servicio_externa = (self.gobierno.estado.deuda_externa * 
-                          self.estado.tasa_interes_internacional)
+        # Simplificado: las reservas caen con déficit y servicio de deuda externa.
+        # Se acumula en dos buffers para no crear un temporal por término.
+        estado = self.estado
+        gobierno = self.gobierno.estado
         
         # Exportaciones (hidrocarburos y minerales)
-        exportaciones = (self.estado.precio_gas * self.estado.produccion_gas * 0.8 +
-                        self.estado.precio_minerales * self.estado.produccion_minerales * 0.0004)
-        
-        # Importaciones (función del PIB)
-        importaciones = self.estado.pib * 0.25
-        
-        balanza_comercial = exportaciones - importaciones
-        
-        cambio_reservas = balanza_comercial - servicio_externa
-        if deficit < 0:
-            cambio_reservas += deficit * 0.3  # Parte del déficit reduce reservas
-        
-        self.estado.reservas_internacionales += cambio_reservas
-        self.estado.reservas_internacionales = max(
-            self.estado.reservas_internacionales, 0
-        )
+        cambio_reservas = np.multiply(estado.precio_gas, estado.produccion_gas)
+        cambio_reservas *= 0.8
+        termino = np.multiply(estado.precio_minerales, estado.produccion_minerales)
+        termino *= 0.0004
+        cambio_reservas += termino
+        
+        # Importaciones (función del PIB) y servicio de deuda externa
+        cambio_reservas -= np.multiply(estado.pib, 0.25, out=termino)
+        cambio_reservas -= np.multiply(gobierno.deuda_externa,
+                                       estado.tasa_interes_internacional, out=termino)
+        
+        # Parte del déficit reduce reservas
+        termino = np.minimum(gobierno.deficit, 0.0, out=termino)
+        termino *= 0.3
+        cambio_reservas += termino
+        
+        reservas = estado.reservas_internacionales  # vista de la fila del estado
+        np.add(reservas, cambio_reservas, out=reservas)
+        np.maximum(reservas, 0.0, out=reservas)
         
     def simular_periodo(self) -> EstadoEconomia:
         """
@@ -271,8 +428,13 @@ class ModeloEstocastico:
         6. Actualizar reservas
         7. Guardar estado
         """
-        # 1. Generar shocks
-        shocks = self.generar_shocks()
+        # 1. Shocks del periodo (pregenerados por `simular`)
+        t = self.estado.periodo
+        if self._shocks is not None and t < len(self._shocks):
+            bloque = self._shocks[t]
+        else:
+            bloque = self.generar_shocks()[0]
+        shocks = dict(zip(NOMBRES_SHOCKS, bloque))
         
         # 2. Actualizar variables exógenas
         self.actualizar_precios_internacionales(shocks)
@@ -281,53 +443,60 @@ class ModeloEstocastico:
         self.actualizar_tasas_interes()
         
         # 3. Gobierno toma decisiones
-        if self.gobierno:
-            self.gobierno.actualizar_estado(
-                pib=self.estado.pib,
-                precio_gas=self.estado.precio_gas,
-                precio_minerales=self.estado.precio_minerales,
-                produccion_gas=self.estado.produccion_gas,
-                produccion_minerales=self.estado.produccion_minerales,
-                tasa_interes_interna=self.estado.tasa_interes_domestica,
-                tasa_interes_externa=self.estado.tasa_interes_internacional,
-                shock_ingresos=shocks['ingresos'],
-                shock_gastos=shocks['gastos']
-            )
-        
-        # 4. Actualizar reservas internacionales
-        self.actualizar_reservas()
+        self.gobierno.actualizar_estado(
+            pib=self.estado.pib,
+            precio_gas=self.estado.precio_gas,
+            precio_minerales=self.estado.precio_minerales,
+            produccion_gas=self.estado.produccion_gas,
+            produccion_minerales=self.estado.produccion_minerales,
+            tasa_interes_interna=self.estado.tasa_interes_domestica,
+            tasa_interes_externa=self.estado.tasa_interes_internacional,
+            shock_ingresos=shocks['ingresos'],
+            shock_gastos=shocks['gastos'],
+            t=self.estado.periodo
+        )
+        
+        # 4. Actualizar reservas internacionales (sin gobierno quedan fijas)
+        if self._con_gobierno:
+            self.actualizar_reservas()
         
         # 5. Avanzar periodo
         self.estado.periodo += 1
-        self.estado.trimestre += 1
-        if self.estado.trimestre > 4:
-            self.estado.trimestre = 1
-            self.estado.año += 1
-        
-        # 6. Guardar en historia
-        estado_dict = {
-            **self.estado.__dict__,
-            'gobierno': self.gobierno.estado.__dict__ if self.gobierno else {}
-        }
-        self.historia.append(estado_dict)
+        self.estado.año, self.estado.trimestre = calendario(
+            self.estado.periodo, self.params_sim.año_inicio
+        )
+        
+        # 6. Guardar en historia (el gobierno guarda la suya en su agente)
+        self.historia.registrar(self.estado.datos, self.estado.periodo - 1)
+        self._resultados = None
         
         return self.estado
     
-    def simular(self, num_periodos: int = None) -> pd.DataFrame:
+    def horizonte(self) -> int:
+        """Número de trimestres entre el año de inicio y el de fin configurados"""
+        años = self.params_sim.año_fin - self.params_sim.año_inicio
+        return años * self.params_sim.periodos_por_año
+    
+    def simular(self, num_periodos: int = None, shocks: np.ndarray = None) -> pd.DataFrame:
         """
         Ejecuta simulación completa
         
         Args:
             num_periodos: número de periodos a simular (trimestres)
+            shocks: arreglo (T, len(NOMBRES_SHOCKS), num_simulaciones) ya
+                escalado, como el de `generar_shocks`; por defecto se sortea
         
         Returns:
             DataFrame con historia completa
         """
         if num_periodos is None:
-            años = self.params_sim.año_fin - self.params_sim.año_inicio
-            num_periodos = años * self.params_sim.periodos_por_año
+            num_periodos = self.horizonte() if shocks is None else len(shocks)
         
         self.inicializar()
+        self._shocks = self.generar_shocks(num_periodos) if shocks is None else shocks
+        precision = self.params_sim.precision_historial
+        self.historia.reservar(num_periodos, tipo=precision)
+        self.gobierno.reservar_historia(num_periodos, tipo=precision)
         
         for t in range(num_periodos):
             self.simular_periodo()
@@ -335,49 +504,86 @@ class ModeloEstocastico:
         return self.obtener_resultados()
     
     def obtener_resultados(self) -> pd.DataFrame:
-        """Convierte la historia en DataFrame"""
-        if not self.historia:
-            return pd.DataFrame()
+        """
+        Convierte la historia en DataFrame
         
-        # Aplanar estructura anidada
-        datos = []
-        for registro in self.historia:
-            fila = {k: v for k, v in registro.items() if k != 'gobierno'}
-            
-            # Agregar variables del gobierno con prefijo
-            if 'gobierno' in registro:
-                for k, v in registro['gobierno'].items():
-                    fila[f'gob_{k}'] = v
-            
-            datos.append(fila)
+        Una fila por periodo; con varias simulaciones el formato es largo
+        (periodo, simulacion), con las simulaciones contiguas por periodo.
+        Los buffers (T, n, campos) del modelo y del gobierno se concatenan
+        en un único bloque float64 que pandas adopta sin inferir tipos.
         
-        return pd.DataFrame(datos)
+        El DataFrame se guarda hasta el siguiente periodo simulado: llamadas
+        repetidas devuelven el mismo objeto.
+        """
+        if self._resultados is not None:
+            return self._resultados
+        
+        num_periodos = len(self.historia)
+        if num_periodos == 0:
+            return pd.DataFrame()
+        
+        n = self.num_simulaciones
+        
+        # Calendario: el registro t corresponde al periodo t + 1
+        t = np.arange(1, num_periodos + 1)
+        columnas_calendario = {'periodo': np.repeat(t, n)}
+        if n > 1:
+            columnas_calendario['simulacion'] = np.tile(np.arange(n), num_periodos)
+        años, trimestres = calendario(t, self.params_sim.año_inicio)
+        columnas_calendario['año'] = np.repeat(años, n)
+        columnas_calendario['trimestre'] = np.repeat(trimestres, n)
+        
+        # Un solo bloque float64 (T·n, columnas) con el estado y el gobierno
+        bloques = [self.historia.como_arreglo()]
+        if self.gobierno.historia.campos:
+            bloques.append(self.gobierno.historia.como_arreglo()[:num_periodos])
+        valores = np.concatenate(bloques, axis=2).reshape(-1, len(self._columnas))
+        
+        df = pd.DataFrame(valores, columns=self._columnas, dtype=np.float64, copy=False)
+        for posicion, (columna, datos_columna) in enumerate(columnas_calendario.items()):
+            df.insert(posicion, columna, datos_columna)
+        self._resultados = df
+        return df
     
     def calcular_metricas_sostenibilidad(self) -> Dict:
         """
         Calcula métricas de sostenibilidad fiscal al final de la simulación
+        
+        Con varias simulaciones cada métrica es un arreglo (num_simulaciones,).
         """
-        if not self.gobierno:
+        if not self.gobierno.historia.campos:
             return {}
         
-        df = self.obtener_resultados()
+        # Directo de los buffers (T, num_simulaciones, campos), sin DataFrame
+        estado = self.historia.como_arreglo()
+        gobierno = self.gobierno.historia.como_arreglo()[:len(estado)]
+        campos_gobierno = self.gobierno.historia.campos
         
-        # Último periodo
-        ultimo = df.iloc[-1]
+        def serie(campo):
+            # (T, num_simulaciones)
+            if campo in INDICE_CAMPOS:
+                return estado[:, :, INDICE_CAMPOS[campo]]
+            return gobierno[:, :, campos_gobierno.index(campo)]
         
-        # Promedio últimos 4 trimestres (1 año)
-        ultimo_año = df.iloc[-4:]
+        # Último periodo y promedio de los últimos 4 trimestres (1 año)
+        ratio_deuda = serie('ratio_deuda_pib')
+        ratio_deficit = serie('ratio_deficit_pib')
+        pib_final = serie('pib')[-1]
         
         metricas = {
-            'ratio_deuda_pib_final': ultimo['gob_ratio_deuda_pib'],
-            'ratio_deuda_pib_promedio': ultimo_año['gob_ratio_deuda_pib'].mean(),
-            'ratio_deficit_pib_final': ultimo['gob_ratio_deficit_pib'],
-            'ratio_deficit_pib_promedio': ultimo_año['gob_ratio_deficit_pib'].mean(),
-            'carga_intereses': (ultimo['gob_servicio_deuda'] / ultimo['pib']),
-            'deuda_total_final': ultimo['gob_deuda_total'],
-            'reservas_finales': ultimo['reservas_internacionales'],
-            'pib_final': ultimo['pib'],
-            'tasa_crecimiento_promedio': df['tasa_crecimiento_pib'].mean()
+            'ratio_deuda_pib_final': ratio_deuda[-1],
+            'ratio_deuda_pib_promedio': ratio_deuda[-4:].mean(axis=0),
+            'ratio_deficit_pib_final': ratio_deficit[-1],
+            'ratio_deficit_pib_promedio': ratio_deficit[-4:].mean(axis=0),
+            'carga_intereses': serie('servicio_deuda')[-1] / pib_final,
+            'deuda_total_final': serie('deuda_total')[-1],
+            'reservas_finales': serie('reservas_internacionales')[-1],
+            'pib_final': pib_final,
+            'tasa_crecimiento_promedio': serie('tasa_crecimiento_pib').mean(axis=0)
         }
         
+        # Con una sola simulación se mantienen valores escalares
+        if self.num_simulaciones == 1:
+            metricas = {k: float(v[0]) for k, v in metricas.items()}
+        
         return metricas
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Parámetros del modelo estocástico de déficit fiscal
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, is_dataclass, replace
 from typing import Dict, List
 
 
@@ -158,6 +158,10 @@ class ParametrosSimulacion:
     
     tipo_distribucion_shocks: str = "normal"
     grados_libertad_t: int = 5
+    
+    # Precisión con que se guarda la historia ("float64" o "float32"); los
+    # cálculos de cada periodo se hacen siempre en float64
+    precision_historial: str = "float64"
 
 
 class ConfiguracionModelo:
@@ -212,12 +216,27 @@ class ConfiguracionModelo:
         if self.simulacion.año_fin <= self.simulacion.año_inicio:
             errores.append("Año final debe ser posterior al año inicial")
         
+        if self.simulacion.precision_historial not in ("float64", "float32"):
+            errores.append("Precisión del historial debe ser 'float64' o 'float32'")
+        
         return errores
     
+    def copiar(self) -> 'ConfiguracionModelo':
+        """
+        Copia independiente de la configuración
+        
+        Todos los parámetros son inmutables (números y cadenas), así que basta
+        con reconstruir cada sección con `dataclasses.replace`.
+        """
+        nuevo_config = ConfiguracionModelo.__new__(ConfiguracionModelo)
+        for seccion, parametros in vars(self).items():
+            setattr(nuevo_config, seccion,
+                    replace(parametros) if is_dataclass(parametros) else parametros)
+        return nuevo_config
+    
     def generar_escenario(self, nombre: str, ajustes: Dict) -> 'ConfiguracionModelo':
         """Genera un nuevo escenario con parámetros ajustados"""
-        import copy
-        nuevo_config = copy.deepcopy(self)
+        nuevo_config = self.copiar()
         nuevo_config.actualizar_desde_dict(ajustes)
         return nuevo_config
 
@@ -9,15 +9,17 @@ def analizar_resultados(resumen: pd.DataFrame, umbral: float = 80.0) -> dict:
       - deuda_pib_p95
     Devuelve un diccionario con estadísticas para usar en la app.
     """
-    ultimo = resumen.iloc[-1]
+    # Acceso por columna: evita construir una Serie (de tipo object) para la fila
+    ultimo = len(resumen) - 1
+    deuda_media = float(resumen["deuda_pib_media"].iat[ultimo])
 
     estadisticas = {
-        "anio_final": int(ultimo["anio"]),
-        "ratio_deuda_pib_final": float(ultimo["deuda_pib_media"]),
-        "ratio_deuda_pib_p5_final": float(ultimo["deuda_pib_p5"]),
-        "ratio_deuda_pib_p95_final": float(ultimo["deuda_pib_p95"]),
+        "anio_final": int(resumen["anio"].iat[ultimo]),
+        "ratio_deuda_pib_final": deuda_media,
+        "ratio_deuda_pib_p5_final": float(resumen["deuda_pib_p5"].iat[ultimo]),
+        "ratio_deuda_pib_p95_final": float(resumen["deuda_pib_p95"].iat[ultimo]),
         "umbral_sostenibilidad": umbral,
-        "es_riesgoso": bool(ultimo["deuda_pib_media"] > umbral),
+        "es_riesgoso": deuda_media > umbral,
     }
 
     return {
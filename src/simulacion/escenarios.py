@@ -1,25 +1,32 @@
-from src.modelo.parametros import ParametrosModelo
+"""
+Acceso a los escenarios predefinidos en `parametros.ESCENARIOS`
+"""
+from functools import lru_cache
+
+from src.modelo.parametros import ConfiguracionModelo, ESCENARIOS
+
+
+@lru_cache(maxsize=None)
+def _escenario_cacheado(nombre: str) -> ConfiguracionModelo:
+    """Configuración de un escenario ya normalizado, construida una sola vez"""
+    return ConfiguracionModelo().generar_escenario(nombre, ESCENARIOS[nombre]['ajustes'])
 
-def get_escenario(nombre: str) -> ParametrosModelo:
-    nombre = nombre.lower()
 
-    base = ParametrosModelo()
-
-    if nombre == "pesimista":
-        return ParametrosModelo(
-            crecimiento_pib_medio=0.0,
-            volatilidad_crecimiento=0.03,
-            deficit_primario_medio=-0.05,
-            volatilidad_deficit=0.02,
-            tasa_interes_deuda=0.06
-        )
-    elif nombre == "optimista":
-        return ParametrosModelo(
-            crecimiento_pib_medio=0.04,
-            volatilidad_crecimiento=0.015,
-            deficit_primario_medio=-0.02,
-            volatilidad_deficit=0.01,
-            tasa_interes_deuda=0.04
-        )
-    else:  # base
-        return base
+def get_escenario(nombre: str) -> ConfiguracionModelo:
+    """
+    Configuración de un escenario predefinido
+
+    Cada escenario se construye una sola vez; cada llamada devuelve una
+    copia independiente, que el llamador puede modificar libremente.
+
+    Args:
+        nombre: clave de ESCENARIOS (sin distinguir mayúsculas); un nombre
+            desconocido devuelve el escenario base
+
+    Returns:
+        ConfiguracionModelo con los ajustes del escenario
+    """
+    nombre = nombre.lower()
+    if nombre not in ESCENARIOS:
+        nombre = 'base'
+    return _escenario_cacheado(nombre).copiar()
@@ -4,8 +4,51 @@ Simulación Monte Carlo para análisis de escenarios estocásticos
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 import multiprocessing as mp
+from operator import itemgetter
+
+try:
+    from tqdm import tqdm
+except ImportError:  # sin tqdm, el avance se imprime cada 10 simulaciones
+    tqdm = None
+
+from ..agentes.empresas import AgenteEmpresas
+from ..agentes.gobierno import AgenteGobierno
+from ..modelo.modelo_estocastico import ModeloEstocastico
+from ..modelo.parametros import ESCENARIOS
+
+
+# Métricas de `calcular_metricas_sostenibilidad`, en el orden de sus columnas
+METRICAS = (
+    'ratio_deuda_pib_final',
+    'ratio_deuda_pib_promedio',
+    'ratio_deficit_pib_final',
+    'ratio_deficit_pib_promedio',
+    'carga_intereses',
+    'deuda_total_final',
+    'reservas_finales',
+    'pib_final',
+    'tasa_crecimiento_promedio',
+)
+_extraer_metricas = itemgetter(*METRICAS)
+
+# Eventos críticos: métrica, umbral y sentido (+1 si "mayor que", -1 si "menor que")
+EVENTOS_CRITICOS: Dict[str, Tuple[str, float, int]] = {
+    "deuda_mayor_60_pib": ("ratio_deuda_pib_final", 0.60, 1),
+    "deuda_mayor_70_pib": ("ratio_deuda_pib_final", 0.70, 1),
+    "deuda_mayor_80_pib": ("ratio_deuda_pib_final", 0.80, 1),
+    "deficit_mayor_5_pib": ("ratio_deficit_pib_promedio", -0.05, -1),
+    "deficit_mayor_8_pib": ("ratio_deficit_pib_promedio", -0.08, -1),
+    "reservas_criticas": ("reservas_finales", 3000, -1),
+    "crecimiento_negativo": ("tasa_crecimiento_promedio", 0, -1),
+    "carga_intereses_alta": ("carga_intereses", 0.15, 1),
+}
+
+# Con el sentido, "x < u" pasa a "-x > -u": una sola comparación para todos
+_COLUMNAS_EVENTOS = [columna for columna, _, _ in EVENTOS_CRITICOS.values()]
+_SENTIDOS_EVENTOS = np.array([sentido for _, _, sentido in EVENTOS_CRITICOS.values()], dtype=float)
+_UMBRALES_EVENTOS = np.array([umbral for _, umbral, _ in EVENTOS_CRITICOS.values()]) * _SENTIDOS_EVENTOS
 
 
 class SimuladorMonteCarlo:
@@ -23,24 +66,63 @@ class SimuladorMonteCarlo:
         self.modelo_clase = modelo_clase
         self.config = configuracion
         self.resultados = []
+    
+    @property
+    def resultados(self) -> List[Dict]:
+        """Resultados de la última ejecución, uno por trayectoria"""
+        return self._resultados
+    
+    @resultados.setter
+    def resultados(self, resultados: List[Dict]):
+        self._resultados = resultados
+        self._metricas_cache: Dict[str, np.ndarray] = {}
+    
+    def _arreglo_metrica(self, variable: str) -> np.ndarray:
+        """Valores de una métrica en todas las trayectorias (se construye una vez)"""
+        valores = self._metricas_cache.get(variable)
+        if valores is None:
+            valores = np.fromiter(
+                (r['metricas'][variable] for r in self.resultados),
+                dtype=np.float64, count=len(self.resultados)
+            )
+            self._metricas_cache[variable] = valores
+        return valores
         
+    def semillas_trayectorias(self, num_simulaciones: int) -> List[np.random.SeedSequence]:
+        """
+        Semilla propia de cada trayectoria de una ejecución Monte Carlo
+        
+        Se derivan de la semilla de la configuración con `SeedSequence.spawn`:
+        la semilla i no depende de `num_simulaciones`, y pasarla a
+        `simular_trayectoria` reproduce la trayectoria i.
+        """
+        return np.random.SeedSequence(
+            self.config.simulacion.semilla_aleatoria
+        ).spawn(num_simulaciones)
+    
     def simular_trayectoria(self, 
-                           semilla: int,
+                           semilla,
                            agentes_factory,
-                           num_periodos: int = None) -> Dict:
+                           num_periodos: int = None,
+                           shocks: np.ndarray = None) -> Dict:
         """
         Simula una trayectoria individual
         
         Args:
-            semilla: semilla aleatoria para esta trayectoria
+            semilla: semilla aleatoria para esta trayectoria (entero o
+                SeedSequence, ver `semillas_trayectorias`)
             agentes_factory: función que crea instancias de agentes
             num_periodos: número de periodos a simular
+            shocks: shocks (T, K, 1) ya sorteados con `semilla` (ver
+                `sortear_shocks`); por defecto se sortean aquí
         
         Returns:
-            Diccionario con resultados de la trayectoria
+            Diccionario con resultados de la trayectoria. Los datos van como
+            un arreglo float64 con sus columnas y tipos (ver `datos_trayectoria`),
+            más baratos de enviar entre procesos que un DataFrame.
         """
-        # Configurar con semilla única
-        config_temp = self.config
+        # Configurar con semilla única, sin tocar la configuración compartida
+        config_temp = self.config.copiar()
         config_temp.simulacion.semilla_aleatoria = semilla
         
         # Crear agentes
@@ -50,22 +132,95 @@ class SimuladorMonteCarlo:
         modelo = self.modelo_clase(config_temp, agentes)
         
         # Simular
-        df_resultados = modelo.simular(num_periodos)
+        df_resultados = modelo.simular(num_periodos, shocks=shocks)
         
         # Métricas de sostenibilidad
         metricas = modelo.calcular_metricas_sostenibilidad()
         
         return {
             'semilla': semilla,
-            'datos': df_resultados,
+            'datos_arreglo': df_resultados.to_numpy(dtype=np.float64),
+            'datos_columnas': df_resultados.columns.tolist(),
+            'datos_tipos': df_resultados.dtypes.to_dict(),
             'metricas': metricas
         }
     
+    def sortear_shocks(self,
+                       semillas: List,
+                       agentes_factory,
+                       num_periodos: int = None) -> np.ndarray:
+        """
+        Sortea los shocks de cada trayectoria con su propia semilla
+        
+        Un solo modelo de una simulación reinicia su generador con cada
+        semilla, así que el bloque i coincide con el que sortearía
+        `simular_trayectoria(semillas[i], ...)` sin shocks.
+        
+        Returns:
+            Arreglo contiguo (len(semillas), T, K, 1): el bloque `[i]` es
+            el argumento `shocks` de la trayectoria i
+        """
+        modelo = self.modelo_clase(self.config, agentes_factory(self.config))
+        if num_periodos is None:
+            num_periodos = modelo.horizonte()
+        
+        bloques = []
+        for semilla in semillas:
+            modelo.reiniciar_generador(semilla)
+            bloques.append(modelo.generar_shocks(num_periodos))  # (T, K, 1)
+        return np.stack(bloques)
+    
+    def simular_lote(self,
+                     num_simulaciones: int,
+                     agentes_factory,
+                     num_periodos: int = None) -> List[Dict]:
+        """
+        Simula todas las trayectorias a la vez en un solo modelo vectorizado
+        
+        El modelo avanza las `num_simulaciones` trayectorias en cada periodo
+        con operaciones NumPy, sin un bucle de Python por trayectoria ni
+        procesos. Los shocks de cada una salen de su propia semilla (ver
+        `semillas_trayectorias`), así que el resultado coincide con el de
+        la ruta secuencial y cada 'semilla' reproduce su trayectoria.
+        
+        Returns:
+            Lista de resultados con el mismo formato que `simular_trayectoria`
+        """
+        semillas = self.semillas_trayectorias(num_simulaciones)
+        shocks = self.sortear_shocks(semillas, agentes_factory, num_periodos)
+        agentes = agentes_factory(self.config)
+        modelo = self.modelo_clase(self.config, agentes, num_simulaciones)
+        
+        # (N, T, K, 1) -> (T, K, N), el formato de `generar_shocks`
+        df = modelo.simular(shocks=np.ascontiguousarray(np.moveaxis(shocks[..., 0], 0, 2)))
+        metricas = modelo.calcular_metricas_sostenibilidad()
+        
+        # (T, simulaciones, columnas) sin la columna de índice de simulación
+        columnas = [col for col in df.columns if col != 'simulacion']
+        tipos = df[columnas].dtypes.to_dict()
+        arreglo = df[columnas].to_numpy(dtype=np.float64).reshape(
+            -1, num_simulaciones, len(columnas)
+        )
+        
+        return [
+            {
+                'semilla': semillas[i],
+                'simulacion': i,
+                'datos_arreglo': arreglo[:, i],
+                'datos_columnas': columnas,
+                'datos_tipos': tipos,
+                'metricas': {k: float(np.asarray(v).reshape(-1)[i])
+                             for k, v in metricas.items()}
+            }
+            for i in range(num_simulaciones)
+        ]
+    
     def ejecutar_montecarlo(self,
                            num_simulaciones: int,
                            agentes_factory,
                            num_periodos: int = None,
-                           paralelo: bool = True) -> Dict:
+                           paralelo: bool = True,
+                           vectorizado: bool = False) -> Dict:
         """
         Ejecuta simulaciones Monte Carlo
         
@@ -74,51 +229,51 @@ class SimuladorMonteCarlo:
             agentes_factory: función que crea agentes
             num_periodos: periodos por trayectoria
             paralelo: si usar procesamiento paralelo
+            vectorizado: simular todas las trayectorias en un solo modelo
+                (ver `simular_lote`); tiene prioridad sobre `paralelo`
         
         Returns:
             Diccionario con todos los resultados
         """
         print(f"Iniciando {num_simulaciones} simulaciones Monte Carlo...")
         
-        # Generar semillas únicas
-        semillas = list(range(num_simulaciones))
+        # Una semilla reproducible por trayectoria
+        semillas = self.semillas_trayectorias(num_simulaciones)
         
         resultados = []
         
-        if paralelo and num_simulaciones > 10:
+        if vectorizado:
+            resultados = self.simular_lote(num_simulaciones, agentes_factory, num_periodos)
+        elif paralelo and num_simulaciones > 10:
             # Procesamiento paralelo
+            shocks = self.sortear_shocks(semillas, agentes_factory, num_periodos)
             num_cores = max(1, mp.cpu_count() - 1)
             print(f"Usando {num_cores} núcleos en paralelo")
             
-            with ProcessPoolExecutor(max_workers=num_cores) as executor:
-                futures = {
-                    executor.submit(
-                        self.simular_trayectoria,
-                        semilla,
-                        agentes_factory,
-                        num_periodos
-                    ): semilla for semilla in semillas
-                }
+            # Modelo, configuración y fábrica viajan una vez por proceso;
+            # cada tarea envía su semilla y su bloque de shocks, en lotes de `chunksize`
+            chunksize = max(1, num_simulaciones // (num_cores * 4))
+            with ProcessPoolExecutor(
+                max_workers=num_cores,
+                mp_context=_contexto_procesos(),
+                initializer=_iniciar_trabajador,
+                initargs=(self.modelo_clase, self.config, agentes_factory, num_periodos)
+            ) as executor:
+                salidas = executor.map(_simular_semilla, semillas, shocks, chunksize=chunksize)
                 
-                for i, future in enumerate(as_completed(futures)):
-                    try:
-                        resultado = future.result()
+                for resultado in _con_progreso(salidas, num_simulaciones):
+                    if 'error' in resultado:
+                        print(f"Error en simulación {resultado['semilla']}: {resultado['error']}")
+                    else:
                         resultados.append(resultado)
-                        
-                        if (i + 1) % 10 == 0:
-                            print(f"Completado: {i+1}/{num_simulaciones}")
-                    except Exception as e:
-                        print(f"Error en simulación {futures[future]}: {e}")
         else:
             # Procesamiento secuencial
-            for i, semilla in enumerate(semillas):
+            shocks = self.sortear_shocks(semillas, agentes_factory, num_periodos)
+            for i in _con_progreso(range(num_simulaciones), num_simulaciones):
                 resultado = self.simular_trayectoria(
-                    semilla, agentes_factory, num_periodos
+                    semillas[i], agentes_factory, num_periodos, shocks[i]
                 )
                 resultados.append(resultado)
-                
-                if (i + 1) % 10 == 0:
-                    print(f"Completado: {i+1}/{num_simulaciones}")
         
         self.resultados = resultados
         
@@ -136,23 +291,37 @@ class SimuladorMonteCarlo:
         if not self.resultados:
             return {}
         
-        # Extraer métricas de todas las simulaciones
-        metricas_todas = [r['metricas'] for r in self.resultados]
-        df_metricas = pd.DataFrame(metricas_todas)
+        # Métricas de todas las simulaciones escritas en una matriz (n, METRICAS)
+        # de tamaño fijo, sin inferir tipos desde una lista de diccionarios
+        n = len(self.resultados)
+        valores = np.fromiter(
+            (v for r in self.resultados for v in _extraer_metricas(r['metricas'])),
+            dtype=np.float64, count=n * len(METRICAS)
+        )
+        df_metricas = pd.DataFrame(valores.reshape(n, len(METRICAS)),
+                                   columns=list(METRICAS), copy=False)
+        
+        # Estadísticas descriptivas: cada reducción recorre todas las columnas
+        # y los percentiles salen de un solo ordenamiento por columna
+        valores = df_metricas.to_numpy(dtype=np.float64)
+        p5, p25, p50, p75, p95 = np.percentile(valores, [5, 25, 50, 75, 95], axis=0)
+        medias = valores.mean(axis=0)
+        desviaciones = valores.std(axis=0, ddof=1)  # muestral, como pandas
+        minimos = valores.min(axis=0)
+        maximos = valores.max(axis=0)
         
-        # Estadísticas descriptivas
         estadisticas = {}
-        for col in df_metricas.columns:
+        for i, col in enumerate(df_metricas.columns):
             estadisticas[col] = {
-                'media': df_metricas[col].mean(),
-                'mediana': df_metricas[col].median(),
-                'desv_std': df_metricas[col].std(),
-                'min': df_metricas[col].min(),
-                'max': df_metricas[col].max(),
-                'percentil_5': df_metricas[col].quantile(0.05),
-                'percentil_25': df_metricas[col].quantile(0.25),
-                'percentil_75': df_metricas[col].quantile(0.75),
-                'percentil_95': df_metricas[col].quantile(0.95)
+                'media': medias[i],
+                'mediana': p50[i],
+                'desv_std': desviaciones[i],
+                'min': minimos[i],
+                'max': maximos[i],
+                'percentil_5': p5[i],
+                'percentil_25': p25[i],
+                'percentil_75': p75[i],
+                'percentil_95': p95[i]
             }
         
         # Probabilidades de eventos críticos
@@ -177,24 +346,11 @@ class SimuladorMonteCarlo:
         if n == 0:
             return {}
 
-        prob = {
-            "deuda_mayor_60_pib": (df_metricas["ratio_deuda_pib_final"] > 0.60).sum() / n,
-            "deuda_mayor_70_pib": (df_metricas["ratio_deuda_pib_final"] > 0.70).sum() / n,
-            "deuda_mayor_80_pib": (df_metricas["ratio_deuda_pib_final"] > 0.80).sum() / n,
-            "deficit_mayor_5_pib": (
-                df_metricas["ratio_deficit_pib_promedio"] < -0.05
-            ).sum() / n,
-            "deficit_mayor_8_pib": (
-                df_metricas["ratio_deficit_pib_promedio"] < -0.08
-            ).sum() / n,
-            "reservas_criticas": (df_metricas["reservas_finales"] < 3000).sum() / n,
-            "crecimiento_negativo": (
-                df_metricas["tasa_crecimiento_promedio"] < 0
-            ).sum() / n,
-            "carga_intereses_alta": (df_metricas["carga_intereses"] > 0.15).sum() / n,
-        }
+        # (n, eventos): una columna por evento, comparada de una vez con su umbral
+        valores = df_metricas[_COLUMNAS_EVENTOS].to_numpy(dtype=np.float64)
+        frecuencias = (valores * _SENTIDOS_EVENTOS > _UMBRALES_EVENTOS).mean(axis=0)
 
-        return prob
+        return dict(zip(EVENTOS_CRITICOS, frecuencias))
     
     def seleccionar_trayectorias_representativas(self) -> Dict:
         """
@@ -202,30 +358,31 @@ class SimuladorMonteCarlo:
         - Percentil 5 (pesimista)
         - Mediana (central)
         - Percentil 95 (optimista)
+        
+        La 'semilla' de cada una reproduce la trayectoria con
+        `simular_trayectoria(semilla, agentes_factory, num_periodos)`.
         """
         if not self.resultados:
             return {}
         
-        # Ordenar por ratio deuda/PIB final
-        resultados_ordenados = sorted(
-            self.resultados,
-            key=lambda x: x['metricas']['ratio_deuda_pib_final']
-        )
-        
-        n = len(resultados_ordenados)
+        # Estadísticos de orden por ratio deuda/PIB final, sin ordenar todo
+        n = len(self.resultados)
+        ratios = self._arreglo_metrica('ratio_deuda_pib_final')
         
-        indices = {
+        posiciones = {
             'pesimista': int(n * 0.95),  # Peor escenario (alta deuda)
             'central': int(n * 0.50),    # Mediana
             'optimista': int(n * 0.05)   # Mejor escenario (baja deuda)
         }
+        orden = np.argpartition(ratios, sorted(set(posiciones.values())))
         
         trayectorias = {}
-        for nombre, idx in indices.items():
+        for nombre, k in posiciones.items():
+            resultado = self.resultados[orden[k]]
             trayectorias[nombre] = {
-                'datos': resultados_ordenados[idx]['datos'],
-                'metricas': resultados_ordenados[idx]['metricas'],
-                'semilla': resultados_ordenados[idx]['semilla']
+                'datos': datos_trayectoria(resultado),
+                'metricas': resultado['metricas'],
+                'semilla': resultado['semilla']
             }
         
         return trayectorias
@@ -243,7 +400,7 @@ class SimuladorMonteCarlo:
         Returns:
             Valor en el percentil correspondiente
         """
-        metricas = [r['metricas'][variable] for r in self.resultados]
+        metricas = self._arreglo_metrica(variable)
         return np.percentile(metricas, (1 - nivel_confianza) * 100)
     
     def calcular_cvar(self,
@@ -254,7 +411,7 @@ class SimuladorMonteCarlo:
         
         Promedio de los valores en el tail más allá del VaR
         """
-        metricas = np.array([r['metricas'][variable] for r in self.resultados])
+        metricas = self._arreglo_metrica(variable)
         var = self.calcular_valor_en_riesgo(variable, nivel_confianza)
         
         # Valores peores que el VaR
@@ -262,41 +419,89 @@ class SimuladorMonteCarlo:
         
         return tail.mean() if len(tail) > 0 else var
     
+    def simular_con_valor(self,
+                          parametro: str,
+                          valor: float,
+                          semilla: int,
+                          agentes_factory,
+                          num_periodos: int = None) -> Dict:
+        """
+        Fija un parámetro de la configuración y simula una trayectoria
+        
+        Args:
+            parametro: 'seccion.atributo' (ej: 'gobierno.tasa_impositiva_base')
+            valor: valor a asignar
+            semilla: semilla aleatoria de la trayectoria
+            agentes_factory: función que crea agentes
+            num_periodos: periodos por trayectoria
+        """
+        seccion, atributo = parametro.split('.')
+        setattr(getattr(self.config, seccion), atributo, valor)
+        return self.simular_trayectoria(semilla, agentes_factory, num_periodos)
+    
     def analisis_sensibilidad(self,
                              parametro: str,
                              valores: List[float],
-                             agentes_factory) -> pd.DataFrame:
+                             agentes_factory,
+                             paralelo: bool = True) -> pd.DataFrame:
         """
         Análisis de sensibilidad para un parámetro
         
+        Todas las combinaciones (valor, semilla) se reparten en un único pool
+        de procesos; cada valor usa las mismas semillas. La configuración
+        propia no se modifica.
+        
         Args:
             parametro: nombre del parámetro a variar (ej: 'gobierno.tasa_impositiva_base')
             valores: lista de valores a probar
             agentes_factory: función que crea agentes
+            paralelo: si usar procesamiento paralelo
         
         Returns:
             DataFrame con resultados para cada valor
         """
         print(f"Análisis de sensibilidad: {parametro}")
         
+        # Simular (con menos trayectorias)
+        num_sims = min(100, self.config.simulacion.num_simulaciones)
+        tareas_valores = np.repeat(valores, num_sims).tolist()
+        tareas_semillas = list(range(num_sims)) * len(valores)
+        
+        if paralelo and len(tareas_semillas) > 10:
+            num_cores = max(1, mp.cpu_count() - 1)
+            chunksize = max(1, len(tareas_semillas) // (num_cores * 4))
+            with ProcessPoolExecutor(
+                max_workers=num_cores,
+                mp_context=_contexto_procesos(),
+                initializer=_iniciar_trabajador,
+                initargs=(self.modelo_clase, self.config, agentes_factory, None)
+            ) as executor:
+                salidas = list(executor.map(
+                    _simular_valor, [parametro] * len(tareas_semillas),
+                    tareas_valores, tareas_semillas, chunksize=chunksize
+                ))
+        else:
+            simulador = SimuladorMonteCarlo(self.modelo_clase, self.config.copiar())
+            salidas = [
+                simulador.simular_con_valor(parametro, valor, semilla, agentes_factory)
+                for valor, semilla in zip(tareas_valores, tareas_semillas)
+            ]
+        
         resultados_sensibilidad = []
         
-        for valor in valores:
-            print(f"  Probando {parametro} = {valor}")
+        for i, valor in enumerate(valores):
+            print(f"  {parametro} = {valor}")
             
-            # Modificar configuración
-            config_temp = self.config
-            partes = parametro.split('.')
-            obj = getattr(config_temp, partes[0])
-            setattr(obj, partes[1], valor)
+            grupo = []
+            for resultado in salidas[i * num_sims:(i + 1) * num_sims]:
+                if 'error' in resultado:
+                    print(f"Error en simulación {resultado['semilla']}: {resultado['error']}")
+                else:
+                    grupo.append(resultado)
             
-            # Simular (con menos trayectorias)
-            num_sims = min(100, self.config.simulacion.num_simulaciones)
-            
-            simulador_temp = SimuladorMonteCarlo(self.modelo_clase, config_temp)
-            analisis = simulador_temp.ejecutar_montecarlo(
-                num_sims, agentes_factory, paralelo=False
-            )
+            simulador_temp = SimuladorMonteCarlo(self.modelo_clase, self.config)
+            simulador_temp.resultados = grupo
+            analisis = simulador_temp.analizar_resultados()
             
             # Guardar resultado
             fila = {'parametro_valor': valor}
@@ -342,4 +547,178 @@ class SimuladorMonteCarlo:
         
         lineas.append("\n" + "=" * 70)
         
-        return "\n".join(lineas)
\ No newline at end of file
+        return "\n".join(lineas)
+
+
+def datos_trayectoria(resultado: Dict) -> pd.DataFrame:
+    """
+    Reconstruye el DataFrame de una trayectoria de `simular_trayectoria`
+    
+    Sólo se llama para las trayectorias que se muestran, no para todas.
+    """
+    df = pd.DataFrame(resultado['datos_arreglo'], columns=resultado['datos_columnas'])
+    return df.astype(resultado['datos_tipos'], copy=False)
+
+
+def _con_progreso(iterable, total: int):
+    """
+    Recorre `iterable` mostrando el avance
+    
+    Con tqdm es una sola barra que se actualiza en su lugar; sin tqdm se
+    imprime una línea cada 10 elementos.
+    """
+    if tqdm is not None:
+        yield from tqdm(iterable, total=total, desc="Monte Carlo")
+        return
+    
+    for i, elemento in enumerate(iterable):
+        yield elemento
+        if (i + 1) % 10 == 0:
+            print(f"Completado: {i+1}/{total}")
+
+
+def _contexto_procesos():
+    """
+    Contexto de multiprocessing para los pools de este módulo
+    
+    Con 'forkserver' numpy, pandas y el modelo se importan una vez en el
+    proceso servidor y cada trabajador nace de un fork ya cargado; donde no
+    existe (Windows) se usa 'spawn'.
+    """
+    if 'forkserver' not in mp.get_all_start_methods():
+        return mp.get_context('spawn')
+    
+    contexto = mp.get_context('forkserver')
+    contexto.set_forkserver_preload(['numpy', 'pandas', __name__])
+    return contexto
+
+
+# Estado de cada proceso del pool de `ejecutar_montecarlo`
+_TRABAJADOR: Dict = {}
+
+
+def _iniciar_trabajador(modelo_clase, configuracion, agentes_factory, num_periodos):
+    """Inicializador del pool: recibe una sola vez lo común a todas las tareas"""
+    _TRABAJADOR['simulador'] = SimuladorMonteCarlo(modelo_clase, configuracion)
+    _TRABAJADOR['agentes_factory'] = agentes_factory
+    _TRABAJADOR['num_periodos'] = num_periodos
+
+
+def _simular_semilla(semilla: int, shocks: np.ndarray) -> Dict:
+    """
+    Tarea del pool: una trayectoria con el simulador del proceso
+    
+    Un error se devuelve como resultado para no interrumpir el resto del lote.
+    """
+    try:
+        return _TRABAJADOR['simulador'].simular_trayectoria(
+            semilla, _TRABAJADOR['agentes_factory'], _TRABAJADOR['num_periodos'], shocks
+        )
+    except Exception as e:
+        return {'semilla': semilla, 'error': str(e)}
+
+
+def _simular_valor(parametro: str, valor: float, semilla: int) -> Dict:
+    """Tarea del pool de `analisis_sensibilidad`: un valor y una semilla"""
+    try:
+        return _TRABAJADOR['simulador'].simular_con_valor(
+            parametro, valor, semilla,
+            _TRABAJADOR['agentes_factory'], _TRABAJADOR['num_periodos']
+        )
+    except Exception as e:
+        return {'semilla': semilla, 'error': str(e)}
+
+
+def _agentes_por_defecto(config) -> Dict:
+    """Gobierno y empresas, los agentes que usa ModeloEstocastico"""
+    return {
+        'gobierno': AgenteGobierno(config.gobierno),
+        'empresas': AgenteEmpresas(config.empresas)
+    }
+
+
+def _simular_lote(configuracion,
+                  semilla,
+                  num_simulaciones: int,
+                  num_periodos: int,
+                  agentes_factory) -> pd.DataFrame:
+    """
+    Trabajo de un proceso: un lote vectorizado de simulaciones de un escenario
+    
+    Se define a nivel de módulo para que ProcessPoolExecutor pueda enviarlo.
+    """
+    config = configuracion.copiar()
+    config.simulacion.semilla_aleatoria = semilla
+    
+    fabrica = agentes_factory or _agentes_por_defecto
+    modelo = ModeloEstocastico(config, fabrica(config), num_simulaciones)
+    return modelo.simular(num_periodos)
+
+
+def simular_escenarios(configuracion_base,
+                       escenarios: List[str] = None,
+                       num_simulaciones: int = None,
+                       num_periodos: int = None,
+                       num_lotes: int = 1,
+                       agentes_factory=None,
+                       max_workers: int = None) -> pd.DataFrame:
+    """
+    Simula varios escenarios predefinidos en paralelo
+    
+    Cada escenario se divide en `num_lotes` lotes vectorizados que se
+    reparten entre procesos. Cada lote recibe su propio flujo aleatorio
+    mediante `SeedSequence.spawn`, derivado de la semilla de la
+    configuración base, así que el resultado no depende del número de
+    procesos.
+    
+    Args:
+        configuracion_base: ConfiguracionModelo sobre la que se aplican los ajustes
+        escenarios: nombres de ESCENARIOS (por defecto, todos)
+        num_simulaciones: trayectorias por escenario (por defecto, las configuradas)
+        num_periodos: trimestres por trayectoria
+        num_lotes: lotes en que se divide cada escenario
+        agentes_factory: función que crea los agentes (por defecto gobierno y empresas)
+        max_workers: procesos en paralelo (por defecto, núcleos - 1)
+    
+    Returns:
+        DataFrame largo con columnas 'escenario' y 'simulacion'
+    """
+    if escenarios is None:
+        escenarios = list(ESCENARIOS)
+    if num_simulaciones is None:
+        num_simulaciones = configuracion_base.simulacion.num_simulaciones
+    
+    num_lotes = max(1, min(num_lotes, num_simulaciones))
+    tamaños = [len(lote) for lote in np.array_split(np.arange(num_simulaciones), num_lotes)]
+    inicios = np.cumsum([0] + tamaños[:-1])
+    semillas = np.random.SeedSequence(
+        configuracion_base.simulacion.semilla_aleatoria
+    ).spawn(len(escenarios) * num_lotes)
+    
+    tareas = []
+    for i, nombre in enumerate(escenarios):
+        config = configuracion_base.generar_escenario(nombre, ESCENARIOS[nombre]['ajustes'])
+        for j, (tamaño, inicio) in enumerate(zip(tamaños, inicios)):
+            semilla = semillas[i * num_lotes + j]
+            tareas.append((nombre, inicio, (config, semilla, tamaño, num_periodos, agentes_factory)))
+    
+    if len(tareas) == 1:
+        resultados = [_simular_lote(*tareas[0][2])]
+    else:
+        if max_workers is None:
+            max_workers = max(1, mp.cpu_count() - 1)
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=_contexto_procesos()) as executor:
+            futures = [executor.submit(_simular_lote, *argumentos)
+                       for _, _, argumentos in tareas]
+            resultados = [future.result() for future in futures]
+    
+    partes = []
+    for (nombre, inicio, _), df in zip(tareas, resultados):
+        if 'simulacion' not in df.columns:
+            df.insert(1, 'simulacion', 0)
+        df['simulacion'] += inicio
+        df.insert(0, 'escenario', nombre)
+        partes.append(df)
+    
+    return pd.concat(partes, ignore_index=True)
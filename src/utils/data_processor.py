@@ -1,34 +1,104 @@
 """
 Procesamiento avanzado de datos económicos
 """
+import hashlib
 import pandas as pd
 import numpy as np
 from scipy import stats
 from typing import Dict, Tuple, List, Optional
 
+# statsmodels es opcional: se importa una vez por proceso y sólo lo
+# necesitan la autocorrelación, el test ADF y la descomposición
+try:
+    from statsmodels.tsa.stattools import acf as _acf, adfuller as _adfuller
+    from statsmodels.tsa.seasonal import seasonal_decompose as _seasonal_decompose
+except ImportError:
+    _acf = _adfuller = _seasonal_decompose = None
+
+
+def _requiere_statsmodels(funcion):
+    """Devuelve `funcion` o avisa que falta statsmodels"""
+    if funcion is None:
+        raise ImportError("Esta función requiere statsmodels (pip install statsmodels)")
+    return funcion
+
+
+def _variaciones(valores: np.ndarray, periodos: int = 1) -> np.ndarray:
+    """
+    Variación relativa x_t / x_{t-periodos} - 1 (NaN donde no hay referencia)
+    
+    Equivale a `pct_change` sobre el arreglo, sin construir Series intermedias.
+    """
+    anteriores = np.full_like(valores, np.nan)
+    if periodos > 0:
+        anteriores[periodos:] = valores[:-periodos]
+    elif periodos < 0:
+        anteriores[:periodos] = valores[-periodos:]
+    else:
+        anteriores[:] = valores
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return valores / anteriores - 1
+
 
 class DataProcessor:
     """Procesador de datos para análisis estocástico"""
     
     @staticmethod
     def calcular_estadisticas(serie: pd.Series) -> Dict:
-        """Calcula estadísticas descriptivas completas"""
+        """
+        Calcula estadísticas descriptivas completas
+        
+        Trabaja sobre el arreglo sin NaN: los cuantiles salen de una sola
+        llamada y la asimetría y curtosis (con la corrección de muestra de
+        pandas) de los momentos centrales.
+        """
+        valores = serie.dropna().to_numpy(dtype=np.float64)
+        n = len(valores)
+        if n == 0:
+            valores = np.array([np.nan])
+        
+        media = valores.mean()
+        p05, p25, mediana, p75, p95 = np.quantile(valores, [0.05, 0.25, 0.5, 0.75, 0.95])
+        minimo, maximo = valores.min(), valores.max()
+        
+        desvios = valores - media
+        m2 = np.mean(desvios**2)
+        varianza = m2 * n / (n - 1) if n > 1 else np.nan
+        desviacion = np.sqrt(varianza)
+        
+        if n < 3:
+            asimetria = np.nan
+        elif m2 == 0:
+            asimetria = 0.0
+        else:
+            m3 = np.mean(desvios**3)
+            asimetria = np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2**1.5
+        
+        if n < 4:
+            curtosis = np.nan
+        elif m2 == 0:
+            curtosis = 0.0
+        else:
+            g2 = np.mean(desvios**4) / m2**2 - 3
+            curtosis = ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3))
+        
         return {
-            'media': serie.mean(),
-            'mediana': serie.median(),
-            'desviacion': serie.std(),
-            'varianza': serie.var(),
-            'minimo': serie.min(),
-            'maximo': serie.max(),
-            'rango': serie.max() - serie.min(),
-            'percentil_05': serie.quantile(0.05),
-            'percentil_25': serie.quantile(0.25),
-            'percentil_75': serie.quantile(0.75),
-            'percentil_95': serie.quantile(0.95),
-            'coef_variacion': serie.std() / serie.mean() if serie.mean() != 0 else np.nan,
-            'asimetria': serie.skew(),
-            'curtosis': serie.kurtosis(),
-            'n_observaciones': len(serie.dropna())
+            'media': media,
+            'mediana': mediana,
+            'desviacion': desviacion,
+            'varianza': varianza,
+            'minimo': minimo,
+            'maximo': maximo,
+            'rango': maximo - minimo,
+            'percentil_05': p05,
+            'percentil_25': p25,
+            'percentil_75': p75,
+            'percentil_95': p95,
+            'coef_variacion': desviacion / media if media != 0 else np.nan,
+            'asimetria': asimetria,
+            'curtosis': curtosis,
+            'n_observaciones': n
         }
     
     @staticmethod
@@ -41,7 +111,9 @@ class DataProcessor:
             serie: serie temporal
             periodos: número de periodos para el cálculo (1=interanual)
         """
-        return serie.pct_change(periods=periodos) * 100
+        valores = serie.to_numpy(dtype=np.float64)
+        return pd.Series(_variaciones(valores, periodos) * 100,
+                         index=serie.index, name=serie.name)
     
     @staticmethod
     def detectar_tendencia(serie: pd.Series) -> Dict:
@@ -51,15 +123,34 @@ class DataProcessor:
         Returns:
             Dict con pendiente, intercepto, R², p-value
         """
-        serie_limpia = serie.dropna()
-        x = np.arange(len(serie_limpia))
-        y = serie_limpia.values
+        y = serie.dropna().to_numpy(dtype=np.float64)
+        n = len(y)
         
-        if len(x) < 2:
+        if n < 2:
             return {'pendiente': 0, 'intercepto': serie.mean(), 'r2': 0, 'p_value': 1}
         
-        # Regresión lineal
-        slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+        # Regresión lineal sobre x = 0..n-1, en forma cerrada:
+        # x̄ = (n-1)/2 y Sxx = n(n²-1)/12 no dependen de los datos
+        x_media = (n - 1) / 2
+        y_media = y.mean()
+        desvios_y = y - y_media
+        sxx = n * (n * n - 1) / 12
+        sxy = desvios_y @ (np.arange(n) - x_media)
+        syy = desvios_y @ desvios_y
+        
+        slope = sxy / sxx
+        intercept = y_media - slope * x_media
+        r_value = 0.0 if syy == 0 else float(np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0))
+        
+        # Significancia de la pendiente (t de Student con n-2 g.l.), como linregress
+        if n == 2:
+            p_value = 1.0 if y[0] == y[1] else 0.0
+            std_err = 0.0
+        else:
+            gl = n - 2
+            t = r_value * np.sqrt(gl / ((1.0 - r_value + 1e-20) * (1.0 + r_value + 1e-20)))
+            p_value = 2 * stats.t.sf(np.abs(t), gl)
+            std_err = np.sqrt((1 - r_value**2) * syy / sxx / gl)
         
         return {
             'pendiente': slope,
@@ -82,12 +173,15 @@ class DataProcessor:
             ventana: ventana móvil (None = toda la serie)
             anualizar: si multiplicar por sqrt(periodos_por_año)
         """
-        retornos = serie.pct_change().dropna()
+        retornos = _variaciones(serie.to_numpy(dtype=np.float64))
+        retornos = retornos[~np.isnan(retornos)]
         
         if ventana:
-            volatilidad = retornos.rolling(window=ventana).std().iloc[-1]
+            # Sólo interesa la última ventana móvil
+            volatilidad = (retornos[-ventana:].std(ddof=1)
+                           if len(retornos) >= ventana else np.nan)
         else:
-            volatilidad = retornos.std()
+            volatilidad = retornos.std(ddof=1) if len(retornos) > 1 else np.nan
         
         if anualizar:
             # Asumiendo datos anuales
@@ -126,6 +220,19 @@ class DataProcessor:
             'exponencial': stats.expon
         }
         
+        # Kolmogorov-Smirnov con una sola ordenación para todas las distribuciones:
+        # D = máx(F(x_i) - (i-1)/n, i/n - F(x_i)) sobre los datos ordenados
+        ordenados = np.sort(datos)
+        n = len(ordenados)
+        fda_empirica = np.arange(1, n + 1) / n
+        fda_empirica_previa = fda_empirica - 1 / n
+        
+        # Anderson-Darling (más sensible); no depende de la distribución ajustada
+        try:
+            ad_stat = stats.anderson(datos).statistic
+        except:
+            ad_stat = np.nan
+        
         resultados = {}
         
         for nombre, dist in distribuciones.items():
@@ -134,15 +241,9 @@ class DataProcessor:
                 params = dist.fit(datos)
                 
                 # Test de Kolmogorov-Smirnov
-                ks_stat, p_value = stats.kstest(datos, 
-                                                lambda x: dist.cdf(x, *params))
-                
-                # Test de Anderson-Darling (más sensible)
-                try:
-                    ad_result = stats.anderson(datos)
-                    ad_stat = ad_result.statistic
-                except:
-                    ad_stat = np.nan
+                fda = dist.cdf(ordenados, *params)
+                ks_stat = max((fda - fda_empirica_previa).max(), (fda_empirica - fda).max())
+                p_value = float(np.clip(stats.kstwo.sf(ks_stat, n), 0, 1))
                 
                 resultados[nombre] = {
                     'parametros': params,
@@ -182,26 +283,31 @@ class DataProcessor:
             metodo: 'iqr', 'zscore', 'modified_zscore'
             umbral: umbral para detección (1.5 para IQR, 3 para z-score)
         """
-        if metodo == 'iqr':
-            Q1 = serie.quantile(0.25)
-            Q3 = serie.quantile(0.75)
-            IQR = Q3 - Q1
-            outliers = (serie < (Q1 - umbral * IQR)) | (serie > (Q3 + umbral * IQR))
-            
-        elif metodo == 'zscore':
-            z_scores = np.abs((serie - serie.mean()) / serie.std())
-            outliers = z_scores > umbral
-            
-        elif metodo == 'modified_zscore':
-            median = serie.median()
-            mad = np.median(np.abs(serie - median))
-            modified_z = 0.6745 * (serie - median) / mad
-            outliers = np.abs(modified_z) > umbral
-            
-        else:
-            raise ValueError(f"Método '{metodo}' no reconocido")
+        # Cálculo sobre el arreglo; los NaN se ignoran como en pandas
+        valores = serie.to_numpy(dtype=np.float64)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if metodo == 'iqr':
+                if valores.size == 0:  # nanpercentile devuelve un escalar
+                    return pd.Series(False, index=serie.index, name=serie.name)
+                Q1, Q3 = np.nanpercentile(valores, [25, 75])
+                IQR = Q3 - Q1
+                outliers = (valores < (Q1 - umbral * IQR)) | (valores > (Q3 + umbral * IQR))
+                
+            elif metodo == 'zscore':
+                z_scores = np.abs((valores - np.nanmean(valores)) / np.nanstd(valores, ddof=1))
+                outliers = z_scores > umbral
+                
+            elif metodo == 'modified_zscore':
+                median = np.nanmedian(valores)
+                mad = np.nanmedian(np.abs(valores - median))
+                modified_z = 0.6745 * (valores - median) / mad
+                outliers = np.abs(modified_z) > umbral
+                
+            else:
+                raise ValueError(f"Método '{metodo}' no reconocido")
         
-        return outliers
+        return pd.Series(outliers, index=serie.index, name=serie.name)
     
     @staticmethod
     def suavizar_serie(serie: pd.Series, 
@@ -236,17 +342,14 @@ class DataProcessor:
     def calcular_autocorrelacion(serie: pd.Series, 
                                  nlags: int = 10) -> np.ndarray:
         """Calcula función de autocorrelación"""
-        from statsmodels.tsa.stattools import acf
-        return acf(serie.dropna(), nlags=nlags)
+        return _requiere_statsmodels(_acf)(serie.dropna(), nlags=nlags)
     
     @staticmethod
     def test_estacionariedad(serie: pd.Series) -> Dict:
         """
         Test de estacionariedad (Augmented Dickey-Fuller)
         """
-        from statsmodels.tsa.stattools import adfuller
-        
-        resultado = adfuller(serie.dropna())
+        resultado = _requiere_statsmodels(_adfuller)(serie.dropna())
         
         return {
             'adf_statistic': resultado[0],
@@ -267,12 +370,10 @@ class DataProcessor:
             periodo: período de estacionalidad (None = automático)
             modelo: 'additive' o 'multiplicative'
         """
-        from statsmodels.tsa.seasonal import seasonal_decompose
-        
         if periodo is None:
             periodo = min(12, len(serie) // 2)
         
-        decomposition = seasonal_decompose(
+        decomposition = _requiere_statsmodels(_seasonal_decompose)(
             serie.dropna(), 
             model=modelo, 
             period=periodo,
@@ -376,12 +477,18 @@ def preparar_datos_para_modelo(datos: Dict[str, pd.DataFrame],
         df_filtrado = df[(df['anio'] >= año_inicio) & (df['anio'] <= año_fin)].copy()
         datos_modelo[nombre] = df_filtrado
     
+    # Años de cada tabla resumidos en un digest de sus bytes (en float64,
+    # para que el tipo entero de la columna no afecte la comparación)
+    digests_años = {
+        hashlib.blake2b(df['anio'].to_numpy(dtype=np.float64).tobytes(),
+                        digest_size=16).digest()
+        for df in datos_modelo.values()
+    }
+    
     # Validaciones
     validaciones = {
         'datos_completos': all(len(df) > 0 for df in datos_modelo.values()),
-        'años_consistentes': len(set(
-            tuple(df['anio'].values) for df in datos_modelo.values()
-        )) == 1,
+        'años_consistentes': len(digests_años) == 1,
         'sin_nulos_criticos': True  # Implementar según necesidad
     }
     
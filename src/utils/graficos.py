@@ -1,11 +1,33 @@
 """
 Funciones auxiliares para gráficos con matplotlib.
+
+matplotlib se importa al graficar, no al importar el módulo: los procesos
+de Monte Carlo que nunca grafican no pagan su carga ni la detección del
+backend.
 """
 
-import matplotlib.pyplot as plt
+import os
+import sys
+
 import pandas as pd
 
+
+def _pyplot():
+    """
+    pyplot, con backend Agg (sin interfaz) si pyplot aún no se importó
+
+    Si pyplot ya está cargado (Jupyter, TkAgg...) o MPLBACKEND fija el
+    backend, se respeta el existente.
+    """
+    import matplotlib
+    if 'matplotlib.pyplot' not in sys.modules and not os.environ.get('MPLBACKEND'):
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
 def grafico_deuda_con_bandas(df: pd.DataFrame):
+    plt = _pyplot()
     fig, ax = plt.subplots()
     ax.plot(df["anio"], df["deuda_pib_media"], label="Media")
     if "deuda_pib_p5" in df.columns and "deuda_pib_p95" in df.columns:
@@ -19,4 +41,7 @@ def grafico_deuda_con_bandas(df: pd.DataFrame):
     ax.set_xlabel("Año")
     ax.set_ylabel("Deuda/PIB (%)")
     ax.legend()
+    # La figura sigue siendo utilizable (savefig, st.pyplot), pero pyplot
+    # deja de retenerla: en barridos largos no se acumulan figuras abiertas
+    plt.close(fig)
     return fig
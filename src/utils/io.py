@@ -2,99 +2,253 @@
 Módulo para carga y procesamiento de datos CSV
 Todos los archivos tienen 'anio' como primera columna
 """
-import pandas as pd
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+import pandas as pd
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import warnings
-warnings.filterwarnings('ignore')
+
+
+# DataFrames ya procesados, por (ruta absoluta, mtime del CSV, firma del
+# formato); compartidos entre instancias de DataLoader del mismo proceso
+_CACHE_DATAFRAMES: Dict[Tuple[str, float, str], pd.DataFrame] = {}
+
+
+def _esquema(*columnas: str) -> Dict[str, str]:
+    """Tipos de un CSV: 'anio' entero y el resto de columnas numéricas"""
+    return {'anio': 'Int32', **dict.fromkeys(columnas, 'float64')}
 
 
 class DataLoader:
     """Cargador de datos económicos de Bolivia desde CSV"""
     
-    def __init__(self, data_dir: str = "data/processed"):
+    # Tipos por archivo; evitan que pandas infiera cada columna al leer
+    SCHEMAS: Dict[str, Dict[str, str]] = {
+        'balanza_pagos': _esquema(
+            'cuenta_corriente', 'exp_bienes_servicios', 'imp_bienes_servicios',
+            'cap_nec_financiamiento', 'cuenta_financiera', 'activos_reserva'),
+        'deuda_publica_externa': _esquema(
+            'deuda_ext_total', 'deuda_ext_prestamos', 'deuda_ext_titulos'),
+        'IPC': _esquema(
+            'alemania', 'argentina', 'belgica', 'brasil', 'colombia', 'chile',
+            'estados_unidos', 'Suiza', 'japon', 'mexico', 'peru', 'reino_unido'),
+        'minerales': _esquema(
+            'zinc', 'estanio', 'oro', 'plata', 'antimonio', 'plomo', 'wolfram',
+            'cobre', 'bismuto', 'hierro', 'ulexita', 'acido_borico',
+            'trioxido_arsenico', 'sal_natural', 'baritima', 'carbonato_litio',
+            'cloruro_potasio', 'manganeso'),
+        'PIB_actividad_economica': _esquema(
+            'pib_mercado', 'pib_basico', 'pib_extraccion', 'pib_petroleo_gas',
+            'pib_minerales', 'elect_agua_gas'),
+        'PIB_tipo_gasto': _esquema(
+            'cons_gob', 'cons_hogares', 'var_existencias', 'fbcf', 'exp_bs',
+            'imp_bs', 'pib_mercado'),
+        'SPNF': _esquema(
+            'ing_totales', 'ing_tributarios', 'renta_interna', 'renta_aduanera',
+            'regalias_mineras', 'imp_hidrocarburos', 'otros_ing_corr',
+            'ing_capital', 'eg_totales', 'eg_corrientes', 'int_ext', 'int_int',
+            'eg_capital', 'supdef_corr', 'supdef_global', 'financiamiento',
+            'cred_ext_neto', 'cred_int_neto'),
+        'stock_deuda_publica': _esquema(
+            'deuda_pub_sector_publico', 'deuda_pub_cred_liquidez',
+            'deuda_pub_bonos_pub', 'deuda_pub_cred_emerg',
+            'deuda_pub_sector_privado', 'deuda_pub_total'),
+        'tasa_interes_internacional': _esquema('libor6m', 'prime', 'sofr1m'),
+        'tipo_de_camnio': _esquema(
+            'tc_oficial_compra', 'tc_oficial_venta',
+            'tc_paralelo_compra', 'tc_paralelo_venta'),
+    }
+    
+    # Clave de cada dataset en datos_cargados y archivo CSV del que se lee
+    ARCHIVOS: Dict[str, str] = {
+        'balanza_pagos': 'balanza_pagos',
+        'deuda_externa': 'deuda_publica_externa',
+        'ipc': 'IPC',
+        'minerales': 'minerales',
+        'pib_actividad': 'PIB_actividad_economica',
+        'pib_gasto': 'PIB_tipo_gasto',
+        'spnf': 'SPNF',
+        'stock_deuda': 'stock_deuda_publica',
+        'tasa_interes': 'tasa_interes_internacional',
+        'tipo_cambio': 'tipo_de_camnio',  # Nota: el archivo tiene typo "camnio"
+    }
+    
+    # Formato de los archivos: separador ';', decimales con coma, miles con
+    # punto, BOM UTF-8 y '-' / 'n.d.' para datos faltantes
+    FORMATO_CSV = dict(sep=';', decimal=',', thousands='.',
+                       encoding='utf-8-sig', skipinitialspace=True,
+                       na_values=['-', '-   ', 'n.d.'])
+    
+    def __init__(self, data_dir: str = "data/processed",
+                 usar_cache_parquet: bool = True):
         self.data_dir = Path(data_dir)
+        # Leer/escribir el Parquet junto a cada CSV (ver `cargar_csv`)
+        self.usar_cache_parquet = usar_cache_parquet
         self.datos_cargados = {}
+        # Años ordenados de cada dataset cargado: {dataset: (df, anios)}
+        self._anio_index: Dict[str, Tuple[pd.DataFrame, np.ndarray]] = {}
         
-    def cargar_csv(self, nombre_archivo: str) -> pd.DataFrame:
+    @staticmethod
+    def limpiar_cache():
+        """Vacía la caché en memoria de CSV procesados (útil en pruebas)"""
+        _CACHE_DATAFRAMES.clear()
+    
+    def _firma_formato(self, nombre_archivo: str) -> str:
+        """Huella del esquema y formato con que se procesa un CSV"""
+        descripcion = repr((self.SCHEMAS.get(nombre_archivo),
+                            sorted(self.FORMATO_CSV.items())))
+        return hashlib.sha1(descripcion.encode()).hexdigest()[:12]
+    
+    def _ruta_cache(self, nombre_archivo: str, firma: str) -> Path:
+        """
+        Archivo Parquet junto al CSV con la versión ya procesada
+        
+        El nombre lleva la firma del formato: si cambian SCHEMAS o
+        FORMATO_CSV, los Parquet anteriores dejan de usarse.
+        """
+        return self.data_dir / f"{nombre_archivo}.{firma}.parquet"
+    
+    def cargar_csv(self, nombre_archivo: str,
+                   usecols: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Carga un archivo CSV genérico
         Todos tienen 'anio' como primera columna
+        
+        Los archivos con esquema en SCHEMAS se leen con tipos fijos; `usecols`
+        limita las columnas leídas (conviene incluir 'anio').
+        
+        Cada archivo se procesa una vez por proceso mientras no cambie su
+        fecha de modificación; las cargas siguientes devuelven una copia
+        del DataFrame guardado, que el llamador puede modificar sin alterar
+        la caché.
+        
+        El resultado limpio se guarda en un Parquet junto al CSV; mientras
+        el CSV y su esquema/formato no cambien, las cargas siguientes leen
+        el Parquet. Sin pyarrow
+        (o sin permiso de escritura, o con `usar_cache_parquet=False`) se lee
+        siempre el CSV.
         """
         ruta = self.data_dir / f"{nombre_archivo}.csv"
         
         if not ruta.exists():
             raise FileNotFoundError(f"Archivo no encontrado: {ruta}")
         
-        df = pd.read_csv(ruta)
+        mtime = ruta.stat().st_mtime
+        firma = self._firma_formato(nombre_archivo)
+        clave = (str(ruta.resolve()), mtime, firma)
+        if clave in _CACHE_DATAFRAMES:
+            df = _CACHE_DATAFRAMES[clave]
+            return df.copy() if usecols is None else df[usecols]
+        
+        cache = self._ruta_cache(nombre_archivo, firma) if self.usar_cache_parquet else None
+        if cache is not None and cache.exists() and cache.stat().st_mtime >= mtime:
+            try:
+                df = pd.read_parquet(cache)
+            except (ImportError, OSError, ValueError):
+                pass  # caché ilegible: se vuelve a procesar el CSV
+            else:
+                _CACHE_DATAFRAMES[clave] = df
+                return df.copy() if usecols is None else df[usecols]
+        
+        esquema = self.SCHEMAS.get(nombre_archivo)
+        # Motor C: el de pyarrow no admite `thousands` ni `skipinitialspace`,
+        # que estos archivos necesitan, y el esquema ya fija los tipos
+        df = pd.read_csv(ruta, dtype=esquema, usecols=usecols, engine='c',
+                         na_filter=True, **self.FORMATO_CSV)
         
         # Asegurar que 'anio' sea la primera columna y esté en formato correcto
         if 'anio' in df.columns:
-            df['anio'] = pd.to_numeric(df['anio'], errors='coerce')
-            df = df.dropna(subset=['anio'])
-            df['anio'] = df['anio'].astype(int)
-            df = df.sort_values('anio').reset_index(drop=True)
+            # Con esquema, o si pandas ya leyó los años como enteros, no hay
+            # nada que convertir
+            convertir = esquema is None and not pd.api.types.is_integer_dtype(df['anio'])
+            if convertir and not pd.api.types.is_numeric_dtype(df['anio']):
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', category=FutureWarning)
+                    df['anio'] = pd.to_numeric(df['anio'], errors='coerce')
+            # Filas sin año (en blanco o pies de tabla) se descartan siempre,
+            # también con el 'Int32' del esquema
+            if df['anio'].hasnans:
+                df = df.dropna(subset=['anio'])
+            if convertir:
+                df['anio'] = df['anio'].astype(int)
+            # Los CSV suelen venir ya ordenados por año: solo se ordena si hace falta
+            if not df['anio'].is_monotonic_increasing:
+                df.sort_values('anio', inplace=True, kind='stable')
+            df.index = pd.RangeIndex(len(df))
+        
+        if usecols is None:  # las cachés guardan siempre el archivo completo
+            _CACHE_DATAFRAMES[clave] = df
+            if cache is not None:
+                try:
+                    df.to_parquet(cache, index=False, compression='zstd')
+                except (ImportError, OSError, ValueError):
+                    pass  # sin motor Parquet o sin permiso de escritura: sin caché
+            return df.copy()
         
         return df
     
     def cargar_balanza_pagos(self) -> pd.DataFrame:
         """Carga datos de balanza de pagos"""
-        df = self.cargar_csv('balanza_pagos')
+        df = self.cargar_csv(self.ARCHIVOS['balanza_pagos'])
         self.datos_cargados['balanza_pagos'] = df
         return df
     
     def cargar_deuda_publica_externa(self) -> pd.DataFrame:
         """Carga datos de deuda pública externa"""
-        df = self.cargar_csv('deuda_publica_externa')
+        df = self.cargar_csv(self.ARCHIVOS['deuda_externa'])
         self.datos_cargados['deuda_externa'] = df
         return df
     
     def cargar_ipc(self) -> pd.DataFrame:
         """Carga datos del Índice de Precios al Consumidor"""
-        df = self.cargar_csv('IPC')
+        df = self.cargar_csv(self.ARCHIVOS['ipc'])
         self.datos_cargados['ipc'] = df
         return df
     
     def cargar_minerales(self) -> pd.DataFrame:
         """Carga datos de precios/producción de minerales"""
-        df = self.cargar_csv('minerales')
+        df = self.cargar_csv(self.ARCHIVOS['minerales'])
         self.datos_cargados['minerales'] = df
         return df
     
     def cargar_pib_actividad(self) -> pd.DataFrame:
         """Carga PIB por actividad económica"""
-        df = self.cargar_csv('PIB_actividad_economica')
+        df = self.cargar_csv(self.ARCHIVOS['pib_actividad'])
         self.datos_cargados['pib_actividad'] = df
         return df
     
     def cargar_pib_gasto(self) -> pd.DataFrame:
         """Carga PIB por tipo de gasto"""
-        df = self.cargar_csv('PIB_tipo_gasto')
+        df = self.cargar_csv(self.ARCHIVOS['pib_gasto'])
         self.datos_cargados['pib_gasto'] = df
         return df
     
     def cargar_spnf(self) -> pd.DataFrame:
         """Carga datos del Sector Público No Financiero"""
-        df = self.cargar_csv('SPNF')
+        df = self.cargar_csv(self.ARCHIVOS['spnf'])
         self.datos_cargados['spnf'] = df
         return df
     
     def cargar_stock_deuda(self) -> pd.DataFrame:
         """Carga stock de deuda pública"""
-        df = self.cargar_csv('stock_deuda_publica')
+        df = self.cargar_csv(self.ARCHIVOS['stock_deuda'])
         self.datos_cargados['stock_deuda'] = df
         return df
     
     def cargar_tasa_interes(self) -> pd.DataFrame:
         """Carga tasas de interés internacionales"""
-        df = self.cargar_csv('tasa_interes_internacional')
+        df = self.cargar_csv(self.ARCHIVOS['tasa_interes'])
         self.datos_cargados['tasa_interes'] = df
         return df
     
     def cargar_tipo_cambio(self) -> pd.DataFrame:
         """Carga tipo de cambio"""
-        df = self.cargar_csv('tipo_de_camnio')  # Nota: el archivo tiene typo "camnio"
+        df = self.cargar_csv(self.ARCHIVOS['tipo_cambio'])
         self.datos_cargados['tipo_cambio'] = df
         return df
     
@@ -102,25 +256,20 @@ class DataLoader:
         """Carga todos los archivos de datos"""
         print("Cargando todos los datasets desde CSV...")
         
-        datasets = {
-            'balanza_pagos': self.cargar_balanza_pagos,
-            'deuda_externa': self.cargar_deuda_publica_externa,
-            'ipc': self.cargar_ipc,
-            'minerales': self.cargar_minerales,
-            'pib_actividad': self.cargar_pib_actividad,
-            'pib_gasto': self.cargar_pib_gasto,
-            'spnf': self.cargar_spnf,
-            'stock_deuda': self.cargar_stock_deuda,
-            'tasa_interes': self.cargar_tasa_interes,
-            'tipo_cambio': self.cargar_tipo_cambio
-        }
-        
-        for nombre, func in datasets.items():
-            try:
-                func()
-                print(f"✓ {nombre} cargado ({len(self.datos_cargados[nombre])} registros)")
-            except Exception as e:
-                print(f"✗ Error cargando {nombre}: {str(e)}")
+        # read_csv libera el GIL al leer y convertir: los archivos se leen en
+        # hilos y los resultados se guardan aquí, en el orden de ARCHIVOS
+        num_hilos = min(len(self.ARCHIVOS), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=num_hilos) as executor:
+            futuros = {nombre: executor.submit(self.cargar_csv, archivo)
+                       for nombre, archivo in self.ARCHIVOS.items()}
+            
+            for nombre, futuro in futuros.items():
+                try:
+                    df = futuro.result()
+                    self.datos_cargados[nombre] = df
+                    print(f"✓ {nombre} cargado ({len(df)} registros)")
+                except Exception as e:
+                    print(f"✗ Error cargando {nombre}: {str(e)}")
         
         return self.datos_cargados
     
@@ -147,16 +296,25 @@ class DataLoader:
         if columna not in df.columns:
             raise ValueError(f"Columna '{columna}' no existe en {dataset}")
         
-        # Filtrar por años si se especifica
-        if año_inicio is not None:
-            df = df[df['anio'] >= año_inicio]
-        if año_fin is not None:
-            df = df[df['anio'] <= año_fin]
+        # Filtrar por años si se especifica: cargar_csv deja los años
+        # ordenados, así que el rango es un tramo contiguo de filas
+        anios = self._anios_ordenados(dataset, df)
+        lo = np.searchsorted(anios, año_inicio) if año_inicio is not None else 0
+        hi = (np.searchsorted(anios, año_fin, side='right')
+              if año_fin is not None else len(anios))
         
         # Crear serie con índice de año
-        serie = df.set_index('anio')[columna]
+        serie = df.iloc[lo:hi].set_index('anio')[columna]
         return serie
     
+    def _anios_ordenados(self, dataset: str, df: pd.DataFrame) -> np.ndarray:
+        """Arreglo de años del dataset, reutilizado mientras no se recargue"""
+        guardado = self._anio_index.get(dataset)
+        if guardado is None or guardado[0] is not df:
+            guardado = (df, df['anio'].to_numpy())
+            self._anio_index[dataset] = guardado
+        return guardado[1]
+    
     def fusionar_datasets(self, datasets: List[str], 
                          columnas: Dict[str, List[str]] = None,
                          año_inicio: int = None,
@@ -178,31 +336,38 @@ class DataLoader:
             if dataset not in self.datos_cargados:
                 continue
             
-            df = self.datos_cargados[dataset].copy()
+            df = self.datos_cargados[dataset]
             
             # Filtrar columnas si se especifica
             if columnas and dataset in columnas:
                 cols = ['anio'] + columnas[dataset]
                 df = df[cols]
             
-            # Filtrar por años
-            if año_inicio:
-                df = df[df['anio'] >= año_inicio]
-            if año_fin:
-                df = df[df['anio'] <= año_fin]
-            
-            # Renombrar columnas para evitar conflictos (excepto 'anio')
-            df.columns = ['anio'] + [f"{dataset}_{col}" if col != 'anio' else col 
-                                     for col in df.columns[1:]]
+            # Filtrar por años con una sola máscara
+            if año_inicio or año_fin:
+                mascara = pd.Series(True, index=df.index)
+                if año_inicio:
+                    mascara &= df['anio'] >= año_inicio
+                if año_fin:
+                    mascara &= df['anio'] <= año_fin
+                df = df[mascara]
             
-            dfs.append(df)
-        
-        # Fusionar todos por 'anio'
-        df_final = dfs[0]
-        for df in dfs[1:]:
-            df_final = pd.merge(df_final, df, on='anio', how='outer')
-        
-        df_final = df_final.sort_values('anio').reset_index(drop=True)
+            # Indexar por año y renombrar columnas para evitar conflictos
+            # (set_index/add_prefix devuelven un DataFrame nuevo)
+            dfs.append(df.set_index('anio').add_prefix(f"{dataset}_"))
+        
+        if all(df.index.is_unique for df in dfs):
+            # Fusionar todos por 'anio' en una sola alineación de índices
+            df_final = pd.concat(dfs, axis=1, join='outer')
+        else:
+            # Con años repetidos concat no puede alinear: merge sucesivo,
+            # que combina cada par de filas con el mismo año
+            df_final = dfs[0]
+            for df in dfs[1:]:
+                df_final = pd.merge(df_final, df, left_index=True,
+                                    right_index=True, how='outer')
+        
+        df_final = df_final.sort_index(kind='stable').reset_index()
         
         return df_final
 
@@ -212,6 +377,20 @@ class DataCalibrator:
     
     def __init__(self, datos: Dict[str, pd.DataFrame]):
         self.datos = datos
+        # Datasets indexados por año: {dataset: (df original, df indexado)}
+        self._por_anio: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+        # Última estimación de volatilidades: (datasets usados, resultado)
+        self._volatilidades: Optional[Tuple[Tuple, Dict[str, float]]] = None
+    
+    def _indexado_por_anio(self, dataset: str) -> pd.DataFrame:
+        """Dataset con 'anio' como índice (primer registro de cada año)"""
+        df = self.datos[dataset]
+        guardado = self._por_anio.get(dataset)
+        if guardado is None or guardado[0] is not df:
+            indexado = df.drop_duplicates('anio').set_index('anio')
+            guardado = (df, indexado)
+            self._por_anio[dataset] = guardado
+        return guardado[1]
         
     def calcular_ratios_fiscales(self) -> Dict[str, float]:
         """
@@ -224,29 +403,40 @@ class DataCalibrator:
         df_spnf = self.datos['spnf']
         df_pib = self.datos['pib_gasto']
         
-        # Fusionar por año
-        df = pd.merge(df_spnf, df_pib[['anio', 'pib']], on='anio')
+        # Fusionar por año (un registro por año en cada dataset)
+        try:
+            df = pd.merge(df_spnf, df_pib[['anio', 'pib']], on='anio',
+                          how='inner', validate='one_to_one')
+        except pd.errors.MergeError as e:
+            raise ValueError(f"SPNF y PIB deben tener un solo registro por año: {e}") from e
         
         # Calcular ratios (ajustar nombres de columnas según tu CSV)
-        ratios = {}
-        
         # NOTA: Estos nombres de columnas son ejemplos
         # Deberás ajustarlos según tus datos reales
-        if 'ingresos_totales' in df.columns:
-            ratios['tasa_ingreso_pib'] = (df['ingresos_totales'] / df['pib']).mean()
-        
-        if 'gastos_totales' in df.columns:
-            ratios['tasa_gasto_pib'] = (df['gastos_totales'] / df['pib']).mean()
-        
-        if 'gasto_corriente' in df.columns:
-            ratios['tasa_gasto_corriente_pib'] = (df['gasto_corriente'] / df['pib']).mean()
+        nombres_ratios = {
+            'ingresos_totales': 'tasa_ingreso_pib',
+            'gastos_totales': 'tasa_gasto_pib',
+            'gasto_corriente': 'tasa_gasto_corriente_pib',
+        }
+        cols_presentes = [col for col in nombres_ratios if col in df.columns]
         
-        return ratios
+        # Un solo bloque: todas las columnas entre el PIB y promedio por columna
+        ratios = df[cols_presentes].div(df['pib'], axis=0).mean()
+        return ratios.rename(nombres_ratios).to_dict()
     
     def estimar_volatilidades(self) -> Dict[str, float]:
         """
         Estima volatilidades históricas para shocks estocásticos
+        
+        El resultado se reutiliza mientras `datos` contenga los mismos
+        DataFrames de PIB y minerales.
         """
+        fuentes = (self.datos.get('pib_gasto'), self.datos.get('minerales'))
+        if self._volatilidades is not None and all(
+            a is b for a, b in zip(self._volatilidades[0], fuentes)
+        ):
+            return dict(self._volatilidades[1])
+        
         volatilidades = {}
         
         # Volatilidad de PIB
@@ -260,12 +450,16 @@ class DataCalibrator:
         if 'minerales' in self.datos:
             df_min = self.datos['minerales']
             # Ajustar según tus columnas de precios
-            for col in df_min.columns:
-                if 'precio' in col.lower():
-                    retornos = df_min[col].pct_change().dropna()
-                    volatilidades[f'minerales_{col}'] = retornos.std()
-        
-        return volatilidades
+            cols_precio = [col for col in df_min.columns if 'precio' in col.lower()]
+            if cols_precio:
+                # std omite los NaN de pct_change: equivale a dropna por columna
+                retornos = df_min[cols_precio].pct_change()
+                volatilidades.update(
+                    (f'minerales_{col}', vol) for col, vol in retornos.std().items()
+                )
+        
+        self._volatilidades = (fuentes, volatilidades)
+        return dict(volatilidades)
     
     def calibrar_deuda_inicial(self, año: int = 2020) -> Dict[str, float]:
         """
@@ -274,19 +468,13 @@ class DataCalibrator:
         if 'stock_deuda' not in self.datos:
             return {}
         
-        df_deuda = self.datos['stock_deuda']
-        fila = df_deuda[df_deuda['anio'] == año]
-        
-        if fila.empty:
+        try:
+            fila = self._indexado_por_anio('stock_deuda').loc[año]
+        except KeyError:
             return {}
         
         # Ajustar nombres de columnas según tu CSV
-        valores = {}
-        for col in fila.columns:
-            if col != 'anio':
-                valores[col] = fila[col].values[0]
-        
-        return valores
+        return fila.to_dict()
     
     def generar_configuracion_calibrada(self) -> Dict:
         """
@@ -311,28 +499,29 @@ class DataCalibrator:
 
 def generar_reporte_datos(datos: Dict[str, pd.DataFrame]) -> str:
     """Genera un reporte de los datos cargados"""
-    lineas = []
-    lineas.append("=" * 70)
-    lineas.append("REPORTE DE DATOS CARGADOS (CSV)")
-    lineas.append("=" * 70)
+    buf = io.StringIO()
+    buf.write("=" * 70 + "\n")
+    buf.write("REPORTE DE DATOS CARGADOS (CSV)\n")
+    buf.write("=" * 70 + "\n")
     
     for nombre, df in datos.items():
-        lineas.append(f"\n{nombre.upper()}")
-        lineas.append("-" * 50)
-        lineas.append(f"Dimensiones: {df.shape[0]} filas × {df.shape[1]} columnas")
-        lineas.append(f"Rango años: {df['anio'].min():.0f} - {df['anio'].max():.0f}")
-        lineas.append(f"Columnas: {', '.join(df.columns[1:6].tolist())}...")
-        
-        # Valores nulos
-        nulos = df.isnull().sum()
-        if nulos.sum() > 0:
-            lineas.append("Valores nulos:")
-            for col, num in nulos[nulos > 0].items():
-                lineas.append(f"  - {col}: {num}")
+        buf.write(f"\n{nombre.upper()}\n")
+        buf.write("-" * 50 + "\n")
+        buf.write(f"Dimensiones: {df.shape[0]} filas × {df.shape[1]} columnas\n")
+        buf.write(f"Rango años: {df['anio'].min():.0f} - {df['anio'].max():.0f}\n")
+        buf.write(f"Columnas: {', '.join(df.columns[1:6].tolist())}...\n")
+        
+        # Valores nulos (una sola pasada por dataset)
+        nulos = df.isna().sum()
+        nulos = nulos[nulos > 0]
+        if not nulos.empty:
+            buf.write("Valores nulos:\n")
+            for col, num in nulos.items():
+                buf.write(f"  - {col}: {num}\n")
     
-    lineas.append("\n" + "=" * 70)
+    buf.write("\n" + "=" * 70)
     
-    return "\n".join(lineas)
+    return buf.getvalue()
 
 
 def exportar_resultados(df: pd.DataFrame, 
@@ -2,6 +2,7 @@
 Script de prueba completo del sistema
 Ejecutar: python test_sistema.py
 """
+import importlib
 import sys
 from pathlib import Path
 
@@ -16,17 +17,19 @@ def test_imports():
     print("=" * 70)
     
     modulos = [
-        ("ConfiguracionModelo", "src.modelo.parametros", "ConfiguracionModelo, ESCENARIOS"),
-        ("AgenteGobierno", "src.agentes.gobierno", "AgenteGobierno"),
-        ("AgenteEmpresas", "src.agentes.empresas", "AgenteEmpresas"),
-        ("ModeloEstocastico", "src.modelo.modelo_estocastico", "ModeloEstocastico"),
-        ("DataLoader", "src.utils.io", "DataLoader"),
+        ("ConfiguracionModelo", "src.modelo.parametros", ("ConfiguracionModelo", "ESCENARIOS")),
+        ("AgenteGobierno", "src.agentes.gobierno", ("AgenteGobierno",)),
+        ("AgenteEmpresas", "src.agentes.empresas", ("AgenteEmpresas",)),
+        ("ModeloEstocastico", "src.modelo.modelo_estocastico", ("ModeloEstocastico",)),
+        ("DataLoader", "src.utils.io", ("DataLoader",)),
     ]
     
     resultados = []
     for nombre, modulo, imports in modulos:
         try:
-            exec(f"from {modulo} import {imports}")
+            mod = importlib.import_module(modulo)
+            for atributo in imports:
+                getattr(mod, atributo)
             print(f"✓ {nombre} importado correctamente")
             resultados.append(True)
         except Exception as e:
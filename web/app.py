@@ -3,15 +3,20 @@ Aplicación Web para Simulación de Déficit Fiscal y Deuda Pública de Bolivia
 Versión Simplificada - Funcional
 """
 import streamlit as st
-import pandas as pd
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from pathlib import Path
+import io
+import pickle
 import sys
 
-# Agregar path del proyecto
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Agregar path del proyecto (una sola vez: Streamlit re-ejecuta este script
+# en cada interacción)
+RAIZ_PROYECTO = str(Path(__file__).parent.parent)
+if RAIZ_PROYECTO not in sys.path:
+    sys.path.insert(0, RAIZ_PROYECTO)
 
 from src.modelo.parametros import ConfiguracionModelo, ESCENARIOS
 from src.modelo.modelo_estocastico import ModeloEstocastico
@@ -19,7 +24,7 @@ from src.agentes.gobierno import AgenteGobierno
 from src.agentes.empresas import AgenteEmpresas
 from src.utils.io import DataLoader, generar_reporte_datos
 from src.simulacion.montecarlo import SimuladorMonteCarlo
-from src.modelo.modelo_estocastico import ModeloEstocastico
+from src.simulacion.escenarios import get_escenario
 
 
 # Configuración de la página
@@ -63,11 +68,21 @@ def inicializar_sesion():
         st.session_state.resultados_montecarlo = None
 
 
+DIRECTORIO_DATOS = Path("../data/processed")
+
+
+@st.cache_data(show_spinner=False)
+def _cargar_datasets(directorio: str, version: float) -> dict:
+    """Lee todos los CSV; `version` (último mtime) invalida la caché"""
+    return DataLoader(directorio).cargar_todos()
+
+
 def cargar_datos():
     """Carga los datos desde archivos CSV"""
     try:
-        loader = DataLoader("../data/processed")
-        datos = loader.cargar_todos()
+        version = max((ruta.stat().st_mtime for ruta in DIRECTORIO_DATOS.glob("*.csv")),
+                      default=0.0)
+        datos = _cargar_datasets(str(DIRECTORIO_DATOS), version)
         
         if len(datos) == 0:
             return False, "No se encontraron archivos CSV en data/processed"
@@ -94,6 +109,102 @@ def crear_agentes(config):
     }
 
 
+def resumen_datasets(datos: dict) -> pd.DataFrame:
+    """Filas, columnas y rango de años de cada dataset cargado"""
+    filas = {}
+    for nombre, df in datos.items():
+        if 'anio' in df.columns:
+            año_min, año_max = df['anio'].agg(['min', 'max']).astype(int)
+        else:
+            año_min = año_max = 'N/A'
+        filas[nombre] = {'Filas': len(df), 'Columnas': df.shape[1],
+                         'Año Min': año_min, 'Año Max': año_max}
+    
+    return pd.DataFrame.from_dict(filas, orient='index').rename_axis('Dataset').reset_index()
+
+
+def estadisticas_basicas(serie: pd.Series) -> tuple:
+    """
+    Media, desviación estándar muestral y mediana sobre un solo arreglo
+
+    Mismos valores que `serie.mean()`, `serie.std()` y `serie.median()`
+    (NaN si no alcanzan los datos), sin pasar tres veces por pandas.
+    """
+    valores = serie.dropna().to_numpy(dtype=np.float64)
+    if valores.size == 0:
+        return np.nan, np.nan, np.nan
+
+    media = valores.mean()
+    desviacion = valores.std(ddof=1) if valores.size > 1 else np.nan
+    return media, desviacion, np.median(valores)
+
+
+def histograma_agrupado(serie: pd.Series, titulo: str, eje_x: str = None,
+                        num_barras: int = 30) -> go.Figure:
+    """
+    Histograma con las frecuencias calculadas aquí (np.histogram)
+
+    Al navegador viajan `num_barras` barras en lugar de todos los valores
+    de la serie para que Plotly los agrupe.
+    """
+    frecuencias, bordes = np.histogram(serie.dropna().to_numpy(), bins=num_barras)
+    fig = go.Figure(go.Bar(
+        x=(bordes[:-1] + bordes[1:]) / 2,
+        y=frecuencias,
+        width=np.diff(bordes),
+    ))
+    fig.update_layout(
+        title=titulo,
+        bargap=0,
+        xaxis_title=eje_x,
+        yaxis_title="Frecuencia",
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _simular(config_bytes: bytes, num_periodos: int) -> pd.DataFrame:
+    """
+    Trayectoria simple, memorizada por configuración (serializada) y horizonte
+
+    Streamlit vuelve a ejecutar el script en cada interacción; con los mismos
+    parámetros y semilla se reutiliza el DataFrame ya calculado.
+    """
+    config = pickle.loads(config_bytes)
+    modelo = ModeloEstocastico(config, crear_agentes(config))
+    return modelo.simular(num_periodos=num_periodos)
+
+
+@st.cache_data(show_spinner=False)
+def _ejecutar_montecarlo(config_bytes: bytes, num_simulaciones: int) -> dict:
+    """
+    Análisis Monte Carlo memorizado por configuración y número de simulaciones
+
+    Todas las trayectorias avanzan juntas en un solo modelo vectorizado
+    (sin procesos), con los mismos resultados que la ejecución secuencial.
+    """
+    config = pickle.loads(config_bytes)
+    simulador = SimuladorMonteCarlo(ModeloEstocastico, config)
+    return simulador.ejecutar_montecarlo(
+        num_simulaciones,
+        crear_agentes,
+        vectorizado=True,   # 👈 importante: sin procesos paralelos
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    CSV de un DataFrame para los botones de descarga
+
+    Memorizado por contenido: en cada re-ejecución el mismo resultado no se
+    vuelve a serializar, y las pestañas 2 y 4 comparten la misma entrada.
+    """
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
 def main():
     """Función principal de la aplicación"""
     
@@ -123,10 +234,9 @@ def main():
         st.info(ESCENARIOS[escenario_seleccionado]['descripcion'])
         
         if st.button("Aplicar Escenario"):
-            config = ConfiguracionModelo()
-            if escenario_seleccionado != "base":
-                config.actualizar_desde_dict(ESCENARIOS[escenario_seleccionado]['ajustes'])
-            st.session_state.configuracion = config
+            # get_escenario ya devuelve una copia propia de la sesión, que
+            # los controles de la pestaña 1 pueden modificar
+            st.session_state.configuracion = get_escenario(escenario_seleccionado)
             st.success(f"✓ Escenario '{escenario_seleccionado}' aplicado")
         
         st.markdown("---")
@@ -154,429 +264,439 @@ def main():
     
     # TAB 1: Datos y Configuración
     with tab1:
-        st.header("Datos Cargados")
-        
-        if st.session_state.datos_cargados and len(st.session_state.datos) > 0:
-            # Mostrar resumen
-            st.subheader("Resumen de Datasets")
-            
-            datos_info = []
-            for nombre, df in st.session_state.datos.items():
-                datos_info.append({
-                    'Dataset': nombre,
-                    'Filas': len(df),
-                    'Columnas': len(df.columns),
-                    'Año Min': int(df['anio'].min()) if 'anio' in df.columns else 'N/A',
-                    'Año Max': int(df['anio'].max()) if 'anio' in df.columns else 'N/A'
-                })
-            
-            df_info = pd.DataFrame(datos_info)
-            st.dataframe(df_info, use_container_width=True)
-            
-            # Selector de dataset
-            st.subheader("Vista Detallada")
-            dataset_ver = st.selectbox(
-                "Seleccionar dataset",
-                options=list(st.session_state.datos.keys())
-            )
-            
-            if dataset_ver:
-                df_sel = st.session_state.datos[dataset_ver]
-                
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Filas", len(df_sel))
-                with col2:
-                    st.metric("Columnas", len(df_sel.columns))
-                with col3:
-                    nulos = df_sel.isnull().sum().sum()
-                    st.metric("Valores Nulos", nulos)
-                
-                st.dataframe(df_sel, use_container_width=True)
-                
-                # Gráfico simple
-                if len(df_sel.columns) > 1:
-                    col_grafico = st.selectbox(
-                        "Columna para graficar",
-                        options=[c for c in df_sel.columns if c != 'anio']
-                    )
-                    
-                    if col_grafico and 'anio' in df_sel.columns:
-                        fig = px.line(df_sel, x='anio', y=col_grafico,
-                                     title=f"Evolución de {col_grafico}")
-                        st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("👈 Carga los datos desde el panel lateral")
-        
-        st.markdown("---")
-        st.subheader("⚙️ Parámetros del Modelo")
-        
-        config = st.session_state.configuracion
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**Parámetros Fiscales**")
-            config.gobierno.tasa_impositiva_base = st.slider(
-                "Tasa Impositiva Base",
-                0.0, 0.5, config.gobierno.tasa_impositiva_base, 0.01
-            )
-            
-            config.gobierno.gasto_corriente_base = st.slider(
-                "Gasto Corriente (% PIB)",
-                0.15, 0.40, config.gobierno.gasto_corriente_base, 0.01
-            )
-            
-            config.gobierno.subsidios_base = st.slider(
-                "Subsidios (% PIB)",
-                0.0, 0.10, config.gobierno.subsidios_base, 0.01
-            )
-        
-        with col2:
-            st.write("**Parámetros Macroeconómicos**")
-            config.macroeconomicos.pib_inicial = st.number_input(
-                "PIB Inicial (millones USD)",
-                10000, 100000, int(config.macroeconomicos.pib_inicial), 1000
-            )
-            
-            config.macroeconomicos.tasa_crecimiento_potencial = st.slider(
-                "Tasa Crecimiento Potencial",
-                -0.05, 0.10, config.macroeconomicos.tasa_crecimiento_potencial, 0.005
-            )
-            
-            config.sector_externo.precio_gas_base = st.number_input(
-                "Precio Gas Base (USD)",
-                20, 100, int(config.sector_externo.precio_gas_base), 5
-            )
+        _render_tab1()
     
     # TAB 2: Simulación Simple
     with tab2:
-        st.header("Simulación Estocástica Simple")
-        
-        st.write("""
-        Ejecuta una simulación con los parámetros configurados para ver una posible 
-        trayectoria del déficit fiscal y la deuda pública.
-        """)
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            num_periodos = st.number_input(
-                "Número de Periodos a Simular",
-                4, 80, 40, 4,
-                help="4 periodos = 1 año (trimestral)"
-            )
-        with col2:
-            semilla = st.number_input(
-                "Semilla Aleatoria",
-                0, 9999, 42,
-                help="Para reproducibilidad"
-            )
-        
-        if st.button("▶️ Ejecutar Simulación", type="primary", key="sim_simple"):
-            with st.spinner("Ejecutando simulación..."):
-                try:
-                    config = st.session_state.configuracion
-                    config.simulacion.semilla_aleatoria = semilla
-                    
-                    agentes = crear_agentes(config)
-                    modelo = ModeloEstocastico(config, agentes)
-                    df_resultados = modelo.simular(num_periodos=num_periodos)
-                    
-                    st.session_state.resultados_simulacion = df_resultados
-                    st.success("✓ Simulación completada")
-                    
-                except Exception as e:
-                    st.error(f"Error en simulación: {e}")
-                    import traceback
-                    st.code(traceback.format_exc())
-        
-        # Mostrar resultados si existen
-        if st.session_state.resultados_simulacion is not None:
-            df = st.session_state.resultados_simulacion
-            
-            st.subheader("📊 Resultados")
-            
-            # Métricas finales
-            if len(df) > 0:
-                ultimo = df.iloc[-1]
-                
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    if 'gob_ratio_deuda_pib' in ultimo:
-                        st.metric("Ratio Deuda/PIB Final", 
-                                f"{ultimo['gob_ratio_deuda_pib']:.1%}")
-                    else:
-                        st.metric("Ratio Deuda/PIB Final", "N/A")
-                
-                with col2:
-                    if 'gob_ratio_deficit_pib' in df.columns:
-                        st.metric("Déficit/PIB Promedio",
-                                f"{df['gob_ratio_deficit_pib'].mean():.1%}")
-                    else:
-                        st.metric("Déficit/PIB Promedio", "N/A")
-                
-                with col3:
-                    if 'gob_deuda_total' in ultimo:
-                        st.metric("Deuda Total Final",
-                                f"${ultimo['gob_deuda_total']:.0f}M")
-                    else:
-                        st.metric("Deuda Total Final", "N/A")
-                
-                with col4:
-                    if 'reservas_internacionales' in ultimo:
-                        st.metric("Reservas Finales",
-                                f"${ultimo['reservas_internacionales']:.0f}M")
-                    else:
-                        st.metric("Reservas Finales", "N/A")
-                
-                # Gráficos
-                st.subheader("Evolución Temporal")
-                
-                if 'gob_ratio_deuda_pib' in df.columns:
-                    fig1 = px.line(df, x='periodo', y='gob_ratio_deuda_pib',
-                                  title='Ratio Deuda/PIB',
-                                  labels={'gob_ratio_deuda_pib': 'Ratio (%)', 
-                                         'periodo': 'Periodo'})
-                    fig1.add_hline(y=0.6, line_dash="dash", line_color="red",
-                                  annotation_text="Límite 60%")
-                    st.plotly_chart(fig1, use_container_width=True)
-                
-                if 'pib' in df.columns:
-                    fig2 = px.line(df, x='periodo', y='pib',
-                                  title='Evolución del PIB',
-                                  labels={'pib': 'PIB (millones USD)', 
-                                         'periodo': 'Periodo'})
-                    st.plotly_chart(fig2, use_container_width=True)
-                
-                # Tabla de datos
-                with st.expander("📋 Ver Tabla de Datos Completa"):
-                    st.dataframe(df, use_container_width=True)
-                    
-                    # Botón de descarga
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        "💾 Descargar CSV",
-                        csv,
-                        "simulacion_resultados.csv",
-                        "text/csv"
-                    )
+        _render_tab2()
     
     # TAB 3: Monte Carlo
     with tab3:
-        st.header("Simulación Monte Carlo")
-
-        st.write("""
-        Ejecuta múltiples simulaciones para analizar distribuciones de resultados 
-        y probabilidades de eventos críticos.
-        """)
-
-        # Número de simulaciones
-        num_sims = st.number_input(
-            "Número de Simulaciones",
-            min_value=10,
-            max_value=1000,
-            value=min(100, st.session_state.configuracion.simulacion.num_simulaciones),
-            step=10,
+        _render_tab3()
+    
+    # TAB 4: Resultados
+    with tab4:
+        _render_tab4()
+
+
+@st.fragment
+def _render_tab1():
+    """Pestaña de datos cargados y parámetros del modelo"""
+    st.header("Datos Cargados")
+
+    if st.session_state.datos_cargados and len(st.session_state.datos) > 0:
+        # Mostrar resumen
+        st.subheader("Resumen de Datasets")
+
+        df_info = resumen_datasets(st.session_state.datos)
+        st.dataframe(df_info, use_container_width=True)
+
+        # Selector de dataset
+        st.subheader("Vista Detallada")
+        dataset_ver = st.selectbox(
+            "Seleccionar dataset",
+            options=list(st.session_state.datos.keys())
+        )
+
+        if dataset_ver:
+            df_sel = st.session_state.datos[dataset_ver]
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Filas", len(df_sel))
+            with col2:
+                st.metric("Columnas", len(df_sel.columns))
+            with col3:
+                nulos = int(df_sel.isna().to_numpy().sum())
+                st.metric("Valores Nulos", nulos)
+
+            st.dataframe(df_sel, use_container_width=True)
+
+            # Gráfico simple
+            if len(df_sel.columns) > 1:
+                col_grafico = st.selectbox(
+                    "Columna para graficar",
+                    options=[c for c in df_sel.columns if c != 'anio']
+                )
+
+                if col_grafico and 'anio' in df_sel.columns:
+                    fig = px.line(df_sel, x='anio', y=col_grafico,
+                                 title=f"Evolución de {col_grafico}")
+                    st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("👈 Carga los datos desde el panel lateral")
+
+    st.markdown("---")
+    st.subheader("⚙️ Parámetros del Modelo")
+
+    config = st.session_state.configuracion
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.write("**Parámetros Fiscales**")
+        config.gobierno.tasa_impositiva_base = st.slider(
+            "Tasa Impositiva Base",
+            0.0, 0.5, config.gobierno.tasa_impositiva_base, 0.01
         )
 
-        # Por estabilidad, ejecución secuencial
-        st.info(
-            "Por estabilidad, la simulación Monte Carlo se ejecuta en modo "
-            "secuencial (sin procesamiento paralelo)."
+        config.gobierno.gasto_corriente_base = st.slider(
+            "Gasto Corriente (% PIB)",
+            0.15, 0.40, config.gobierno.gasto_corriente_base, 0.01
         )
 
-        if st.button("▶️ Ejecutar Monte Carlo", type="primary"):
-            with st.spinner(f"Ejecutando {int(num_sims)} simulaciones Monte Carlo..."):
-                try:
-                    config = st.session_state.configuracion
+        config.gobierno.subsidios_base = st.slider(
+            "Subsidios (% PIB)",
+            0.0, 0.10, config.gobierno.subsidios_base, 0.01
+        )
 
-                    simulador = SimuladorMonteCarlo(ModeloEstocastico, config)
-                    analisis = simulador.ejecutar_montecarlo(
-                        int(num_sims),
-                        crear_agentes,
-                        paralelo=False,   # 👈 importante: sin paralelo
-                    )
+    with col2:
+        st.write("**Parámetros Macroeconómicos**")
+        config.macroeconomicos.pib_inicial = st.number_input(
+            "PIB Inicial (millones USD)",
+            10000, 100000, int(config.macroeconomicos.pib_inicial), 1000
+        )
+
+        config.macroeconomicos.tasa_crecimiento_potencial = st.slider(
+            "Tasa Crecimiento Potencial",
+            -0.05, 0.10, config.macroeconomicos.tasa_crecimiento_potencial, 0.005
+        )
+
+        config.sector_externo.precio_gas_base = st.number_input(
+            "Precio Gas Base (USD)",
+            20, 100, int(config.sector_externo.precio_gas_base), 5
+        )
 
-                    # Verificación mínima: debe ser dict y traer df_metricas
-                    if (
-                        not analisis
-                        or not isinstance(analisis, dict)
-                        or "df_metricas" not in analisis
-                    ):
-                        st.error(
-                            "No se pudieron obtener resultados Monte Carlo "
-                            "(no se encontró 'df_metricas'). Revisa la consola "
-                            "donde ejecutas Streamlit para ver errores detallados."
-                        )
-                        st.write("Contenido devuelto por ejecutar_montecarlo():")
-                        st.write(analisis)
-                        st.session_state.resultados_montecarlo = None
-                    else:
-                        st.session_state.resultados_montecarlo = analisis
-                        st.success(f"✓ {int(num_sims)} simulaciones completadas")
-
-                except Exception as e:
-                    st.error(f"Error en la ejecución de Monte Carlo: {e}")
-                    import traceback
-                    st.code(traceback.format_exc())
-
-        # Mostrar resultados si ya existen
-        if st.session_state.resultados_montecarlo is not None:
-            analisis = st.session_state.resultados_montecarlo
-
-            # Asegurarnos de que tenga df_metricas
-            if "df_metricas" not in analisis:
-                st.error(
-                    "Los resultados Monte Carlo no contienen 'df_metricas'. "
-                    "Ejecuta otra vez la simulación."
-                )
-                st.write(analisis)
-            else:
-                df_metricas = analisis["df_metricas"]
 
-                st.subheader("Distribución de resultados Monte Carlo")
+@st.fragment
+def _render_tab2():
+    """Pestaña de simulación simple"""
+    st.header("Simulación Estocástica Simple")
 
-                # Nombre de la columna con el ratio deuda/PIB final
-                # ⚠️ Si en tu df_metricas se llama distinto, cámbialo aquí.
-                col_ratio = "ratio_deuda_pib_final"
+    st.write("""
+    Ejecuta una simulación con los parámetros configurados para ver una posible 
+    trayectoria del déficit fiscal y la deuda pública.
+    """)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        num_periodos = st.number_input(
+            "Número de Periodos a Simular",
+            4, 80, 40, 4,
+            help="4 periodos = 1 año (trimestral)"
+        )
+    with col2:
+        semilla = st.number_input(
+            "Semilla Aleatoria",
+            0, 9999, 42,
+            help="Para reproducibilidad"
+        )
+
+    if st.button("▶️ Ejecutar Simulación", type="primary", key="sim_simple"):
+        with st.spinner("Ejecutando simulación..."):
+            try:
+                config = st.session_state.configuracion
+                config.simulacion.semilla_aleatoria = semilla
+
+                df_resultados = _simular(pickle.dumps(config), int(num_periodos))
+
+                st.session_state.resultados_simulacion = df_resultados
+                st.session_state.simulacion_completada = True
+
+            except Exception as e:
+                st.error(f"Error en simulación: {e}")
+                import traceback
+                st.code(traceback.format_exc())
 
-                if col_ratio not in df_metricas.columns:
-                    st.error(f"No se encontró la columna '{col_ratio}' en df_metricas")
-                    st.write(df_metricas.head())
+        # La pestaña de resultados es otro fragmento: se refresca toda la app
+        if st.session_state.get('simulacion_completada'):
+            st.rerun()
+
+    if st.session_state.pop('simulacion_completada', False):
+        st.success("✓ Simulación completada")
+
+    # Mostrar resultados si existen
+    if st.session_state.resultados_simulacion is not None:
+        df = st.session_state.resultados_simulacion
+
+        st.subheader("📊 Resultados")
+
+        # Métricas finales
+        if len(df) > 0:
+            # Último periodo como dict, columna a columna con .iat: sin armar
+            # una Serie de la fila (que convertiría todos los tipos a float)
+            ultimo = {columna: df[columna].iat[-1] for columna in df.columns}
+
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                if 'gob_ratio_deuda_pib' in ultimo:
+                    st.metric("Ratio Deuda/PIB Final", 
+                            f"{ultimo['gob_ratio_deuda_pib']:.1%}")
                 else:
-                    serie = df_metricas[col_ratio]
-
-                    media = float(serie.mean())
-                    mediana = float(serie.median())
-                    p95 = float(serie.quantile(0.95))
-                    desv = float(serie.std(ddof=1))
-
-                    c1, c2, c3, c4 = st.columns(4)
-                    with c1:
-                        st.metric("Media Deuda/PIB final", f"{media:.1%}")
-                    with c2:
-                        st.metric("Mediana Deuda/PIB final", f"{mediana:.1%}")
-                    with c3:
-                        st.metric("Percentil 95", f"{p95:.1%}")
-                    with c4:
-                        st.metric("Desv. estándar", f"{desv:.1%}")
-
-                    # ==== Histograma de barras (Plotly) ====
-                    import plotly.express as px
-
-                    fig_hist = px.histogram(
-                        df_metricas,
-                        x=col_ratio,
-                        nbins=30,
-                        title="Distribución de Ratio Deuda/PIB Final",
-                        labels={col_ratio: "Ratio Deuda/PIB final"},
-                    )
-                    fig_hist.update_layout(
-                        xaxis_title="Ratio Deuda/PIB final",
-                        yaxis_title="Frecuencia",
-                    )
-                    st.plotly_chart(fig_hist, use_container_width=True)
-
-                    # ==== Gráfico de barras de probabilidades de eventos críticos ====
-                    prob = analisis.get("probabilidades", {})
-
-                    if prob:
-                        st.subheader("Probabilidades de eventos críticos")
-
-                        eventos = [
-                            "deuda_mayor_60_pib",
-                            "deuda_mayor_70_pib",
-                            "deuda_mayor_80_pib",
-                            "reservas_criticas",
-                            "crecimiento_negativo",
-                        ]
-                        nombres_eventos = {
-                            "deuda_mayor_60_pib": "Deuda > 60% PIB",
-                            "deuda_mayor_70_pib": "Deuda > 70% PIB",
-                            "deuda_mayor_80_pib": "Deuda > 80% PIB",
-                            "reservas_criticas": "Reservas críticas",
-                            "crecimiento_negativo": "Crecimiento negativo",
-                        }
-
-                        datos_barra = {
-                            "Evento": [],
-                            "Probabilidad": [],
-                        }
-
-                        for ev in eventos:
-                            if ev in prob:
-                                datos_barra["Evento"].append(nombres_eventos.get(ev, ev))
-                                datos_barra["Probabilidad"].append(float(prob[ev]))
-
-                        if datos_barra["Evento"]:
-                            df_prob = pd.DataFrame(datos_barra)
-                            fig_prob = px.bar(
-                                df_prob,
-                                x="Evento",
-                                y="Probabilidad",
-                                title="Probabilidades estimadas de eventos críticos",
-                                labels={"Probabilidad": "Probabilidad"},
-                            )
-                            fig_prob.update_layout(yaxis_tickformat=".0%")
-                            st.plotly_chart(fig_prob, use_container_width=True)
-                    else:
-                        st.info(
-                            "No se encontraron probabilidades calculadas en los resultados Monte Carlo."
-                        )
-    
-    # TAB 4: Resultados
-    with tab4:
-        st.header("Análisis de Resultados")
-        
-        if st.session_state.resultados_simulacion is not None:
-            df = st.session_state.resultados_simulacion
-            
-            st.subheader("📈 Análisis Estadístico")
-            
-            # Seleccionar variables para analizar
-            variables_disponibles = [c for c in df.columns 
-                                   if c.startswith('gob_') or c in ['pib', 'reservas_internacionales']]
-            
-            variable_analizar = st.selectbox(
-                "Variable a analizar",
-                options=variables_disponibles
-            )
-            
-            if variable_analizar and variable_analizar in df.columns:
-                serie = df[variable_analizar].dropna()
-                
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.metric("Media", f"{serie.mean():.2f}")
-                with col2:
-                    st.metric("Desv. Estándar", f"{serie.std():.2f}")
-                with col3:
-                    st.metric("Mediana", f"{serie.median():.2f}")
-                
-                # Histograma
-                fig = px.histogram(serie, nbins=30,
-                                  title=f"Distribución de {variable_analizar}")
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Serie temporal
-                fig2 = px.line(df, x='periodo', y=variable_analizar,
-                              title=f"Evolución de {variable_analizar}")
+                    st.metric("Ratio Deuda/PIB Final", "N/A")
+
+            with col2:
+                if 'gob_ratio_deficit_pib' in ultimo:
+                    st.metric("Déficit/PIB Promedio",
+                            f"{df['gob_ratio_deficit_pib'].mean():.1%}")
+                else:
+                    st.metric("Déficit/PIB Promedio", "N/A")
+
+            with col3:
+                if 'gob_deuda_total' in ultimo:
+                    st.metric("Deuda Total Final",
+                            f"${ultimo['gob_deuda_total']:.0f}M")
+                else:
+                    st.metric("Deuda Total Final", "N/A")
+
+            with col4:
+                if 'reservas_internacionales' in ultimo:
+                    st.metric("Reservas Finales",
+                            f"${ultimo['reservas_internacionales']:.0f}M")
+                else:
+                    st.metric("Reservas Finales", "N/A")
+
+            # Gráficos
+            st.subheader("Evolución Temporal")
+
+            if 'gob_ratio_deuda_pib' in df.columns:
+                fig1 = px.line(df, x='periodo', y='gob_ratio_deuda_pib',
+                              title='Ratio Deuda/PIB',
+                              labels={'gob_ratio_deuda_pib': 'Ratio (%)', 
+                                     'periodo': 'Periodo'})
+                fig1.add_hline(y=0.6, line_dash="dash", line_color="red",
+                              annotation_text="Límite 60%")
+                st.plotly_chart(fig1, use_container_width=True)
+
+            if 'pib' in df.columns:
+                fig2 = px.line(df, x='periodo', y='pib',
+                              title='Evolución del PIB',
+                              labels={'pib': 'PIB (millones USD)', 
+                                     'periodo': 'Periodo'})
                 st.plotly_chart(fig2, use_container_width=True)
-            
-            st.markdown("---")
-            st.subheader("💾 Exportar Resultados")
-            
-            csv = df.to_csv(index=False)
-            st.download_button(
-                "📥 Descargar Resultados CSV",
-                csv,
-                "resultados_completos.csv",
-                "text/csv"
+
+            # Tabla de datos
+            with st.expander("📋 Ver Tabla de Datos Completa"):
+                st.dataframe(df, use_container_width=True)
+
+                # Botón de descarga
+                csv = _csv_bytes(df)
+                st.download_button(
+                    "💾 Descargar CSV",
+                    csv,
+                    "simulacion_resultados.csv",
+                    "text/csv"
+                )
+
+
+@st.fragment
+def _render_tab3():
+    """Pestaña de simulación Monte Carlo"""
+    st.header("Simulación Monte Carlo")
+
+    st.write("""
+    Ejecuta múltiples simulaciones para analizar distribuciones de resultados 
+    y probabilidades de eventos críticos.
+    """)
+
+    # Número de simulaciones
+    num_sims = st.number_input(
+        "Número de Simulaciones",
+        min_value=10,
+        max_value=1000,
+        value=min(100, st.session_state.configuracion.simulacion.num_simulaciones),
+        step=10,
+    )
+
+    # Por estabilidad, sin procesos paralelos
+    st.info(
+        "Por estabilidad, la simulación Monte Carlo se ejecuta sin "
+        "procesamiento paralelo: todas las trayectorias se calculan "
+        "juntas en un modelo vectorizado."
+    )
+
+    if st.button("▶️ Ejecutar Monte Carlo", type="primary"):
+        with st.spinner(f"Ejecutando {int(num_sims)} simulaciones Monte Carlo..."):
+            try:
+                config = st.session_state.configuracion
+
+                analisis = _ejecutar_montecarlo(pickle.dumps(config), int(num_sims))
+
+                # Verificación mínima: debe ser dict y traer df_metricas
+                if (
+                    not analisis
+                    or not isinstance(analisis, dict)
+                    or "df_metricas" not in analisis
+                ):
+                    st.error(
+                        "No se pudieron obtener resultados Monte Carlo "
+                        "(no se encontró 'df_metricas'). Revisa la consola "
+                        "donde ejecutas Streamlit para ver errores detallados."
+                    )
+                    st.write("Contenido devuelto por ejecutar_montecarlo():")
+                    st.write(analisis)
+                    st.session_state.resultados_montecarlo = None
+                else:
+                    st.session_state.resultados_montecarlo = analisis
+                    st.success(f"✓ {int(num_sims)} simulaciones completadas")
+
+            except Exception as e:
+                st.error(f"Error en la ejecución de Monte Carlo: {e}")
+                import traceback
+                st.code(traceback.format_exc())
+
+    # Mostrar resultados si ya existen
+    if st.session_state.resultados_montecarlo is not None:
+        analisis = st.session_state.resultados_montecarlo
+
+        # Asegurarnos de que tenga df_metricas
+        if "df_metricas" not in analisis:
+            st.error(
+                "Los resultados Monte Carlo no contienen 'df_metricas'. "
+                "Ejecuta otra vez la simulación."
             )
+            st.write(analisis)
         else:
-            st.info("👈 Ejecuta una simulación primero para ver el análisis")
+            df_metricas = analisis["df_metricas"]
+
+            st.subheader("Distribución de resultados Monte Carlo")
+
+            # Nombre de la columna con el ratio deuda/PIB final
+            # ⚠️ Si en tu df_metricas se llama distinto, cámbialo aquí.
+            col_ratio = "ratio_deuda_pib_final"
+
+            if col_ratio not in df_metricas.columns:
+                st.error(f"No se encontró la columna '{col_ratio}' en df_metricas")
+                st.write(df_metricas.head())
+            else:
+                serie = df_metricas[col_ratio]
+
+                media = float(serie.mean())
+                mediana = float(serie.median())
+                p95 = float(serie.quantile(0.95))
+                desv = float(serie.std(ddof=1))
+
+                c1, c2, c3, c4 = st.columns(4)
+                with c1:
+                    st.metric("Media Deuda/PIB final", f"{media:.1%}")
+                with c2:
+                    st.metric("Mediana Deuda/PIB final", f"{mediana:.1%}")
+                with c3:
+                    st.metric("Percentil 95", f"{p95:.1%}")
+                with c4:
+                    st.metric("Desv. estándar", f"{desv:.1%}")
+
+                # ==== Histograma de barras (Plotly) ====
+                fig_hist = histograma_agrupado(
+                    serie,
+                    "Distribución de Ratio Deuda/PIB Final",
+                    eje_x="Ratio Deuda/PIB final",
+                )
+                st.plotly_chart(fig_hist, use_container_width=True)
+
+                # ==== Gráfico de barras de probabilidades de eventos críticos ====
+                prob = analisis.get("probabilidades", {})
+
+                if prob:
+                    st.subheader("Probabilidades de eventos críticos")
+
+                    eventos = [
+                        "deuda_mayor_60_pib",
+                        "deuda_mayor_70_pib",
+                        "deuda_mayor_80_pib",
+                        "reservas_criticas",
+                        "crecimiento_negativo",
+                    ]
+                    nombres_eventos = {
+                        "deuda_mayor_60_pib": "Deuda > 60% PIB",
+                        "deuda_mayor_70_pib": "Deuda > 70% PIB",
+                        "deuda_mayor_80_pib": "Deuda > 80% PIB",
+                        "reservas_criticas": "Reservas críticas",
+                        "crecimiento_negativo": "Crecimiento negativo",
+                    }
+
+                    datos_barra = {
+                        "Evento": [],
+                        "Probabilidad": [],
+                    }
+
+                    for ev in eventos:
+                        if ev in prob:
+                            datos_barra["Evento"].append(nombres_eventos.get(ev, ev))
+                            datos_barra["Probabilidad"].append(float(prob[ev]))
+
+                    if datos_barra["Evento"]:
+                        df_prob = pd.DataFrame(datos_barra)
+                        fig_prob = px.bar(
+                            df_prob,
+                            x="Evento",
+                            y="Probabilidad",
+                            title="Probabilidades estimadas de eventos críticos",
+                            labels={"Probabilidad": "Probabilidad"},
+                        )
+                        fig_prob.update_layout(yaxis_tickformat=".0%")
+                        st.plotly_chart(fig_prob, use_container_width=True)
+                else:
+                    st.info(
+                        "No se encontraron probabilidades calculadas en los resultados Monte Carlo."
+                    )
+
+
+@st.fragment
+def _render_tab4():
+    """Pestaña de análisis de resultados"""
+    st.header("Análisis de Resultados")
+
+    if st.session_state.resultados_simulacion is not None:
+        df = st.session_state.resultados_simulacion
+
+        st.subheader("📈 Análisis Estadístico")
+
+        # Seleccionar variables para analizar
+        variables_disponibles = [c for c in df.columns 
+                               if c.startswith('gob_') or c in ['pib', 'reservas_internacionales']]
+
+        variable_analizar = st.selectbox(
+            "Variable a analizar",
+            options=variables_disponibles
+        )
+
+        if variable_analizar and variable_analizar in df.columns:
+            serie = df[variable_analizar].dropna()
+            media, desviacion, mediana = estadisticas_basicas(serie)
+
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                st.metric("Media", f"{media:.2f}")
+            with col2:
+                st.metric("Desv. Estándar", f"{desviacion:.2f}")
+            with col3:
+                st.metric("Mediana", f"{mediana:.2f}")
+
+            # Histograma
+            fig = histograma_agrupado(serie, f"Distribución de {variable_analizar}",
+                                      eje_x=variable_analizar)
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Serie temporal
+            fig2 = px.line(df, x='periodo', y=variable_analizar,
+                          title=f"Evolución de {variable_analizar}")
+            st.plotly_chart(fig2, use_container_width=True)
+
+        st.markdown("---")
+        st.subheader("💾 Exportar Resultados")
+
+        csv = _csv_bytes(df)
+        st.download_button(
+            "📥 Descargar Resultados CSV",
+            csv,
+            "resultados_completos.csv",
+            "text/csv"
+        )
+    else:
+        st.info("👈 Ejecuta una simulación primero para ver el análisis")
 
 
 if __name__ == "__main__":